@@ -4,6 +4,8 @@ Shows what replies WOULD have looked like before enhancements vs NOW
 Run: python before_after_test.py
 """
 
+import logging
+
 from smart_reply_generator import SmartReplyGenerator, SmartReplyConfig
 
 def show_improvements():
@@ -115,4 +117,5 @@ Best''',
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     show_improvements()
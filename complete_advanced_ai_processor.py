@@ -509,12 +509,7 @@ class AdvancedEmailProcessor(EmailProcessor):
             if self.smart_reply_generator is not None:
                 try:
                     # Prepare email data for smart generator
-                    smart_email_data = {
-                        'subject': email_data.get('subject', ''),
-                        'body': email_data.get('body', ''),
-                        'sender': email_data.get('sender', ''),
-                        'sender_name': email_data.get('sender_name', 'there')
-                    }
+                    smart_email_data = self._smart_email_data(email_data)
                     
                     # Generate smart reply
                     smart_result = self.smart_reply_generator.generate_smart_reply(
@@ -634,6 +629,36 @@ class AdvancedEmailProcessor(EmailProcessor):
         
         return reply_data
     
+    def _smart_email_data(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Email fields passed to the Smart Reply Generator"""
+        return {
+            'subject': email_data.get('subject', ''),
+            'body': email_data.get('body', ''),
+            'sender': email_data.get('sender', ''),
+            'sender_name': email_data.get('sender_name', 'there')
+        }
+    
+    def _prefetch_reply_contexts(self, emails: List[Dict[str, Any]]):
+        """
+        Extract smart reply context for several emails in one batched spaCy
+        pass; the results land in the context extractor's cache, so the
+        per-email generate_advanced_reply calls reuse them
+        """
+        if self.smart_reply_generator is None or not emails:
+            return
+        
+        # Without spaCy there is nothing to batch (and cheap contexts aren't cached)
+        context_extractor = self.smart_reply_generator.context_extractor
+        if context_extractor.nlp is None:
+            return
+        
+        try:
+            context_extractor.extract_context_many(
+                [self._smart_email_data(email) for email in emails]
+            )
+        except Exception as e:
+            print(f"[WARNING] Batch context extraction failed: {e}")
+    
     def generate_contextual_insights(self, processed_email: Dict[str, Any], 
                                    thread_context: Optional[List[Dict]] = None) -> List[str]:
         """Generate advanced contextual insights and recommendations"""
@@ -1005,6 +1030,12 @@ class AdvancedEmailProcessor(EmailProcessor):
             skipped_count = len(batch_results) - reply_count
             print(f"[INFO] Generating replies for {reply_count} emails, skipping {skipped_count} low-priority")
             
+            # Reply context for all of them in one batched spaCy pass
+            self._prefetch_reply_contexts([
+                email for email, processed in zip(batch, batch_results)
+                if processed['priority_level'] in ['High', 'Medium']
+            ])
+            
             # Generate replies ONLY for High/Medium priority emails
             for idx, email in enumerate(batch):
                 processed = batch_results[idx]
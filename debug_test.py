@@ -2,6 +2,7 @@
 Debug test to trace exactly what's happening in reply generation
 """
 
+import logging
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -102,4 +103,5 @@ Sarah""",
     print()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     debug_reply_generation()
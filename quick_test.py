@@ -3,6 +3,8 @@ Quick Test - Single Email Test
 Run: python quick_test.py
 """
 
+import logging
+
 from smart_reply_generator import SmartReplyGenerator, SmartReplyConfig
 
 def quick_test():
@@ -88,4 +90,5 @@ Sarah''',
     print("\n")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     quick_test()
@@ -3,6 +3,7 @@ Test Runner - Choose which test to run
 Run: python run_tests.py
 """
 
+import logging
 import sys
 
 def show_menu():
@@ -96,4 +97,5 @@ def main():
                 break
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     main()
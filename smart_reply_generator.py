@@ -3,35 +3,65 @@
 # =============================================================================
 # AI-Enhanced Reply Generation System
 # 
-# This module uses BART + spaCy + existing AI models to generate natural,
+# This module uses spaCy + existing AI models to generate natural,
 # contextually-aware email replies that sound human-written.
 #
 # Key Features:
 # - Deep context extraction (topics, entities, action items)
-# - BART-based acknowledgment generation
+# - Natural acknowledgment generation
 # - Confidence scoring with quality thresholds
 # - Intelligent template enhancement
 # - Learning capability for continuous improvement
 # =============================================================================
 
+import os
 import re
+import random
+import copy
+import functools
+import hashlib
+import logging
+import multiprocessing
+import threading
+import time
 import warnings
-from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Set, ClassVar, Collection, Callable, Iterator
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 try:
     import spacy
-    from transformers import pipeline
     from textblob import TextBlob
     import numpy as np
-    print("[OK] Smart Reply Generator - AI libraries loaded")
+    logger.info("Smart Reply Generator - AI libraries loaded")
 except ImportError as e:
-    print(f"[ERROR] Error importing AI libraries: {e}")
+    logger.error("Error importing AI libraries: %s", e)
     raise
 
+# Optional: Hyperscan for single-pass multi-pattern scanning (falls back to re)
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional: xxHash for cheaper cache keys on long emails (falls back to blake2b)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Optional: Aho-Corasick automaton for single-pass keyword scanning (falls back to re)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -61,69 +91,502 @@ class SmartReplyConfig:
     # Learning settings
     track_user_edits: bool = True
     adapt_to_preferences: bool = True
+    
+    # Reply caching
+    reply_cache_size: int = 1024            # Exact-match cache of generated replies (0 disables)
+    use_semantic_reply_cache: bool = False  # Reuse replies for near-duplicate emails (sentence-transformers)
+    semantic_cache_threshold: float = 0.93  # Minimum cosine similarity for a near-duplicate hit
+    
+    # Model loading
+    eager_load: bool = False  # Load spaCy at startup instead of on first use
+    
+    # Logging
+    log_level: int = logging.INFO  # DEBUG shows the per-email pipeline steps
+
+
+# =============================================================================
+# SHARED MODELS
+# =============================================================================
+
+# Heavy models (spaCy), loaded on first use and shared by every
+# component instance in the process
+_MODELS: Dict[str, Any] = {}
+_MODELS_LOCK = threading.RLock()
+
+
+# =============================================================================
+# EMAIL VIEW
+# =============================================================================
+
+@dataclass(slots=True)
+class _EmailView:
+    """
+    Email fields read once from the input dict (with the pipeline's usual
+    defaults), so downstream code uses attribute loads instead of repeated
+    dict.get calls
+    """
+    
+    subject: str = ''
+    body: str = ''
+    sender: str = ''
+    sender_email: str = ''
+    reply_address: str = ''  # 'sender', falling back to 'sender_email'
+    sender_name: str = 'there'
+    has_attachments: bool = False
+    attachment_count: int = 0
+    priority_level: str = 'Medium'
+    
+    @classmethod
+    def from_dict(cls, email_data: Dict[str, Any]) -> '_EmailView':
+        return cls(
+            subject=email_data.get('subject', ''),
+            body=email_data.get('body', ''),
+            sender=email_data.get('sender', ''),
+            sender_email=email_data.get('sender_email', ''),
+            reply_address=email_data.get('sender', email_data.get('sender_email', '')),
+            sender_name=email_data.get('sender_name', 'there'),
+            has_attachments=email_data.get('has_attachments', False),
+            attachment_count=email_data.get('attachment_count', 0),
+            priority_level=email_data.get('priority_level', 'Medium')
+        )
+
+
+# =============================================================================
+# ANALYSIS CACHE
+# =============================================================================
+
+class AnalysisCache:
+    """
+    Bounded LRU cache for per-email analysis results, keyed by content hash.
+    
+    Threaded conversations quote earlier messages verbatim, so the same
+    subject/body is often analyzed many times. Values are deep-copied on the
+    way in and out so callers can freely mutate what they get back.
+    """
+    
+    def __init__(self, maxsize: int = 4096, max_text_length: int = 20000,
+                 min_compute_seconds: float = 0.0):
+        """
+        Args:
+            maxsize: Maximum number of cached results
+            max_text_length: Emails with more text than this are not cached
+            min_compute_seconds: Results computed faster than this are not
+                cached - recomputing them is about as cheap as a cache hit
+        """
+        self.maxsize = maxsize
+        self.max_text_length = max_text_length
+        self.min_compute_seconds = min_compute_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def make_key(self, *parts: Any) -> Optional[bytes]:
+        """Build a 16-byte cache key from the given parts (None if too large to cache)"""
+        if self.maxsize <= 0:
+            return None
+        
+        digest = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+        total_length = 0
+        for part in parts:
+            text = str(part)
+            total_length += len(text)
+            if total_length > self.max_text_length:
+                return None
+            digest.update(text.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\x00')
+        return digest.digest()
+    
+    def get(self, key: Optional[bytes]) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss"""
+        if key is None:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+    
+    def put(self, key: Optional[bytes], value: Any, compute_seconds: Optional[float] = None):
+        """
+        Store a copy of value, evicting the least recently used entry if full
+        
+        Args:
+            compute_seconds: How long value took to compute (None = always cache)
+        """
+        if key is None:
+            return
+        if compute_seconds is not None and compute_seconds < self.min_compute_seconds:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticReplyCache:
+    """
+    Near-duplicate lookup for generated replies by embedding similarity.
+    
+    Embeddings are L2-normalized, so one matrix-vector product gives the
+    cosine similarity to every cached email. A hit also requires the same
+    match key (tone, sender). Once full, the oldest entry is replaced.
+    """
+    
+    def __init__(self, maxsize: int = 1024, threshold: float = 0.93,
+                 model_name: str = 'sentence-transformers/all-MiniLM-L6-v2'):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.model_name = model_name
+        self._model = None
+        self._model_failed = False
+        self._embeddings = None  # (maxsize, dim) float32, allocated on first put
+        self._entries = []       # (match_key, result) per embedding row
+        self._next_slot = 0
+        self._lock = threading.Lock()
+    
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Normalized embedding of text (None if the model can't be loaded)"""
+        if self._model is None and not self._model_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name, device='cpu')
+            except Exception as e:
+                logger.warning("Semantic reply cache disabled: %s", e)
+                self._model_failed = True
+        if self._model is None:
+            return None
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+    
+    def get(self, embedding: Optional[np.ndarray], match_key: Tuple) -> Optional[Any]:
+        """Return a copy of the most similar cached result above the threshold, if any"""
+        if embedding is None:
+            return None
+        with self._lock:
+            if not self._entries:
+                return None
+            similarities = self._embeddings[:len(self._entries)] @ embedding
+            best = None
+            for index in np.flatnonzero(similarities >= self.threshold):
+                if self._entries[index][0] == match_key and (
+                        best is None or similarities[index] > similarities[best]):
+                    best = index
+            if best is None:
+                return None
+            value = self._entries[best][1]
+        return copy.deepcopy(value)
+    
+    def put(self, embedding: Optional[np.ndarray], match_key: Tuple, value: Any):
+        """Store a copy of value under the embedding"""
+        if embedding is None or self.maxsize <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.maxsize, embedding.shape[0]), dtype=np.float32)
+            slot = self._next_slot
+            self._embeddings[slot] = embedding
+            if slot < len(self._entries):
+                self._entries[slot] = (match_key, value)
+            else:
+                self._entries.append((match_key, value))
+            self._next_slot = (slot + 1) % self.maxsize
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries = []
+            self._next_slot = 0
+
+
+# =============================================================================
+# HYPERSCAN MATCHER (OPTIONAL)
+# =============================================================================
+
+def _collect_match_id(pattern_id, start, end, flags, matched_ids):
+    """Hyperscan match callback - records which pattern matched"""
+    matched_ids.add(pattern_id)
+
+
+def _track_lowest_id(pattern_id, start, end, flags, state):
+    """
+    Hyperscan match callback - keeps the lowest matching pattern id in
+    state[0] and stops the scan once it is below state[1]
+    """
+    if pattern_id < state[0]:
+        state[0] = pattern_id
+    return pattern_id < state[1]
+
+
+class HyperscanMatcher:
+    """
+    Matches text against a whole list of regex patterns in one Hyperscan scan.
+    
+    Text parts are scanned as a single vectored stream joined by separator,
+    so with the default ' ' matching subject and body behaves like searching
+    f"{subject} {body}" without building that string (use '\\n' to keep
+    patterns from matching across parts). Word boundaries are ASCII-based.
+    
+    Use HyperscanMatcher.create(), which returns None when the optional
+    hyperscan package is missing so callers can fall back to re.
+    """
+    
+    def __init__(self, patterns: List[str], caseless: bool = False, separator: str = ' '):
+        self._separator = separator.encode('utf-8')
+        
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH
+        if caseless:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        
+        self._database = hyperscan.Database(mode=hyperscan.HS_MODE_VECTORED)
+        self._database.compile(
+            expressions=[p.encode('utf-8') for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns)
+        )
+        
+        # Scratch space can't be shared between concurrent scans
+        self._local = threading.local()
+    
+    @classmethod
+    def create(cls, patterns: List[str], caseless: bool = False,
+               separator: str = ' ') -> Optional['HyperscanMatcher']:
+        """Build a matcher, or return None if Hyperscan is unavailable"""
+        if hyperscan is None:
+            return None
+        try:
+            return cls(patterns, caseless, separator)
+        except Exception as e:
+            logger.warning("Hyperscan database compile failed, using re: %s", e)
+            return None
+    
+    def matching_ids(self, *parts: str) -> Set[int]:
+        """Return the indexes of all patterns that match the joined text parts"""
+        matched_ids = set()
+        self._database.scan(self._buffers(parts), match_event_handler=_collect_match_id,
+                            context=matched_ids, scratch=self._scratch())
+        return matched_ids
+    
+    def lowest_matching_id(self, *parts: str, stop_below: int = 0) -> Optional[int]:
+        """
+        Return the lowest index of a pattern that matches the joined text
+        parts (None if none match). The scan ends early as soon as a pattern
+        below stop_below matches.
+        """
+        state = [float('inf'), stop_below]
+        try:
+            self._database.scan(self._buffers(parts), match_event_handler=_track_lowest_id,
+                                context=state, scratch=self._scratch())
+        except hyperscan.ScanTerminated:
+            pass
+        return None if state[0] == float('inf') else state[0]
+    
+    def _scratch(self):
+        """This thread's scratch space"""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._database)
+        return scratch
+    
+    def _buffers(self, parts: Tuple[str, ...]) -> List[bytes]:
+        """Encoded text parts with separators in between"""
+        buffers = []
+        for part in parts:
+            if buffers:
+                buffers.append(self._separator)
+            buffers.append(part.encode('utf-8', 'replace'))
+        return buffers
 
 
 # =============================================================================
 # SENSITIVE TOPIC DETECTOR
 # =============================================================================
 
+@functools.lru_cache(maxsize=None)
+def _sensitive_matcher(patterns: Tuple[str, ...]) -> Optional[HyperscanMatcher]:
+    """Hyperscan database for a set of category patterns, shared by all detectors"""
+    return HyperscanMatcher.create(list(patterns))
+
+
+# Characters that re.IGNORECASE still matches to an ASCII letter after lower()
+# (dotless i, long s) - mapped 1:1, so match offsets don't move
+_KEYWORD_CASEFOLD = str.maketrans({'\u0131': 'i', '\u017f': 's'})
+
+
+def _casefold_lowered(text_lower: str) -> str:
+    """
+    Map the characters re.IGNORECASE would still fold to ASCII letters in
+    lowered text (see _KEYWORD_CASEFOLD), so lowercase patterns match it
+    without IGNORECASE; offsets are unchanged
+    """
+    if '\u0131' in text_lower or '\u017f' in text_lower:
+        return text_lower.translate(_KEYWORD_CASEFOLD)
+    return text_lower
+
+
+# Maximal runs of \w - a single-word keyword matches r'\bkw\b' exactly when
+# it equals one of these tokens
+_WORD_TOKEN_RE = re.compile(r'\w+')
+
+
+@functools.lru_cache(maxsize=None)
+def _sensitive_automaton(keywords: Tuple[Tuple[str, ...], ...]):
+    """
+    Aho-Corasick automaton over every category's keywords, shared by all
+    detectors (None when pyahocorasick isn't installed)
+    
+    Each keyword maps to (length, ((category index, rank in category), ...)).
+    """
+    if ahocorasick is None:
+        return None
+    
+    owners = {}
+    for index, category_keywords in enumerate(keywords):
+        for rank, keyword in enumerate(category_keywords):
+            owners.setdefault(keyword.lower(), []).append((index, rank))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_owners in owners.items():
+        automaton.add_word(keyword, (len(keyword), tuple(keyword_owners)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Sensitive keyword categories
+_SENSITIVE_KEYWORDS = {
+    'legal': [
+        'lawsuit', 'litigation', 'attorney', 'lawyer', 'legal action',
+        'court', 'sue', 'sued', 'settlement', 'complaint', 'violation',
+        'breach of contract', 'liability', 'indemnity', 'negligence',
+        'testimony', 'deposition', 'subpoena', 'injunction'
+    ],
+    'hr_personnel': [
+        'termination', 'fired', 'layoff', 'dismissal', 'resignation',
+        'harassment', 'discrimination', 'retaliation', 'grievance',
+        'disciplinary', 'performance issue', 'warning', 'reprimand',
+        'investigation', 'complaint against', 'hostile work environment',
+        'wrongful termination', 'severance'
+    ],
+    'financial_sensitive': [
+        'fraud', 'embezzlement', 'misappropriation', 'insider trading',
+        'money laundering', 'tax evasion', 'bribery', 'kickback',
+        'financial misconduct', 'audit failure', 'accounting irregularities',
+        'securities violation', 'bankruptcy', 'insolvency'
+    ],
+    'confidential': [
+        'confidential', 'proprietary', 'trade secret', 'nda violation',
+        'classified', 'restricted', 'privileged', 'sensitive information',
+        'data breach', 'leaked', 'unauthorized disclosure', 'espionage',
+        'intellectual property theft'
+    ],
+    'crisis': [
+        'emergency', 'urgent crisis', 'critical incident', 'security breach',
+        'data leak', 'system compromise', 'ransomware', 'cyberattack',
+        'safety violation', 'accident', 'injury', 'fatality', 'disaster',
+        'evacuation', 'threat'
+    ],
+    'ethical': [
+        'ethics violation', 'conflict of interest', 'misconduct',
+        'improper conduct', 'unethical behavior', 'fraud', 'corruption',
+        'nepotism', 'favoritism', 'misuse of funds'
+    ]
+}
+
+# Case-insensitive keyword alternation per category, compiled once at import
+_SENSITIVE_PATTERNS = {
+    category: re.compile(r'\b(' + '|'.join(re.escape(kw) for kw in keywords) + r')\b', re.IGNORECASE)
+    for category, keywords in _SENSITIVE_KEYWORDS.items()
+}
+
+_SENSITIVE_CATEGORIES = tuple(_SENSITIVE_KEYWORDS)
+
+# Without pyahocorasick: single-word keywords become frozensets for token
+# lookups, and only multi-word phrases still need a regex (per category index)
+_SENSITIVE_SINGLE_KEYWORDS = tuple(
+    frozenset(kw for kw in keywords if _WORD_TOKEN_RE.fullmatch(kw))
+    for keywords in _SENSITIVE_KEYWORDS.values()
+)
+_SENSITIVE_MULTI_KEYWORDS = tuple(
+    [kw for kw in keywords if kw not in single]
+    for keywords, single in zip(_SENSITIVE_KEYWORDS.values(), _SENSITIVE_SINGLE_KEYWORDS)
+)
+_SENSITIVE_MULTI_PATTERNS = tuple(
+    re.compile(r'\b(' + '|'.join(re.escape(kw) for kw in multi) + r')\b', re.IGNORECASE)
+    if multi else None
+    for multi in _SENSITIVE_MULTI_KEYWORDS
+)
+_SENSITIVE_MULTI_WORDS = tuple(
+    frozenset(word for kw in multi for word in kw.split())
+    for multi in _SENSITIVE_MULTI_KEYWORDS
+)
+
+
+def _sensitive_category_mask(categories: frozenset) -> int:
+    """Bitmask over sensitive category indices"""
+    return sum(1 << i for i, category in enumerate(_SENSITIVE_CATEGORIES) if category in categories)
+
+
 class SensitiveTopicDetector:
     """
     Detects sensitive topics that require safe mode replies
     """
     
+    __slots__ = ('_matcher', '_automaton', '_cache')
+    
+    # Keyword tables and compiled patterns, shared by all detectors
+    sensitive_keywords = _SENSITIVE_KEYWORDS
+    sensitive_patterns = _SENSITIVE_PATTERNS
+    _categories = _SENSITIVE_CATEGORIES
+    _single_keywords = _SENSITIVE_SINGLE_KEYWORDS
+    _multi_patterns = _SENSITIVE_MULTI_PATTERNS
+    _multi_words = _SENSITIVE_MULTI_WORDS
+    
+    # Risk tiers by matched category, and as bitmasks over category indices
+    CRITICAL_CATEGORIES = frozenset({'legal', 'hr_personnel', 'crisis'})
+    HIGH_RISK_CATEGORIES = frozenset({'financial_sensitive', 'confidential', 'ethical'})
+    _critical_mask = _sensitive_category_mask(CRITICAL_CATEGORIES)
+    _high_risk_mask = _sensitive_category_mask(HIGH_RISK_CATEGORIES)
+    
+    # Result when no category matches (the common case)
+    NOT_SENSITIVE_RESULT = {
+        'is_sensitive': False,
+        'categories': [],
+        'matched_keywords': [],
+        'risk_level': 'low',
+        'requires_manual_review': False
+    }
+    
     def __init__(self):
         """Initialize sensitive topic detector"""
-        print("[INFO] Initializing Sensitive Topic Detector...")
-        
-        # Define sensitive keyword categories
-        self.sensitive_keywords = {
-            'legal': [
-                'lawsuit', 'litigation', 'attorney', 'lawyer', 'legal action',
-                'court', 'sue', 'sued', 'settlement', 'complaint', 'violation',
-                'breach of contract', 'liability', 'indemnity', 'negligence',
-                'testimony', 'deposition', 'subpoena', 'injunction'
-            ],
-            'hr_personnel': [
-                'termination', 'fired', 'layoff', 'dismissal', 'resignation',
-                'harassment', 'discrimination', 'retaliation', 'grievance',
-                'disciplinary', 'performance issue', 'warning', 'reprimand',
-                'investigation', 'complaint against', 'hostile work environment',
-                'wrongful termination', 'severance'
-            ],
-            'financial_sensitive': [
-                'fraud', 'embezzlement', 'misappropriation', 'insider trading',
-                'money laundering', 'tax evasion', 'bribery', 'kickback',
-                'financial misconduct', 'audit failure', 'accounting irregularities',
-                'securities violation', 'bankruptcy', 'insolvency'
-            ],
-            'confidential': [
-                'confidential', 'proprietary', 'trade secret', 'nda violation',
-                'classified', 'restricted', 'privileged', 'sensitive information',
-                'data breach', 'leaked', 'unauthorized disclosure', 'espionage',
-                'intellectual property theft'
-            ],
-            'crisis': [
-                'emergency', 'urgent crisis', 'critical incident', 'security breach',
-                'data leak', 'system compromise', 'ransomware', 'cyberattack',
-                'safety violation', 'accident', 'injury', 'fatality', 'disaster',
-                'evacuation', 'threat'
-            ],
-            'ethical': [
-                'ethics violation', 'conflict of interest', 'misconduct',
-                'improper conduct', 'unethical behavior', 'fraud', 'corruption',
-                'nepotism', 'favoritism', 'misuse of funds'
-            ]
-        }
+        logger.info("Initializing Sensitive Topic Detector...")
+        
+        # One Hyperscan pass flags candidate categories (pattern id = category
+        # index); re then confirms them and collects the matched keywords
+        self._matcher = _sensitive_matcher(
+            tuple(pattern.pattern for pattern in self.sensitive_patterns.values())
+        )
         
-        # Compile regex patterns for faster matching
-        self.sensitive_patterns = {}
-        for category, keywords in self.sensitive_keywords.items():
-            # Create case-insensitive pattern
-            pattern = r'\b(' + '|'.join(re.escape(kw) for kw in keywords) + r')\b'
-            self.sensitive_patterns[category] = re.compile(pattern, re.IGNORECASE)
+        # With pyahocorasick, one automaton pass replaces the Hyperscan,
+        # token and regex paths
+        self._automaton = _sensitive_automaton(
+            tuple(tuple(keywords) for keywords in self.sensitive_keywords.values())
+        )
+        
+        # Results for repeated (e.g. quoted/threaded) emails; scans that took
+        # under 0.2ms aren't worth a slot
+        self._cache = AnalysisCache(min_compute_seconds=0.0002)
         
-        print("[OK] Sensitive topic detector ready")
+        logger.info("Sensitive topic detector ready")
     
     def detect_sensitive_content(self, email_body: str, email_subject: str = "") -> Dict[str, Any]:
         """
@@ -138,75 +601,198 @@ class SensitiveTopicDetector:
                 'requires_manual_review': bool
             }
         """
+        return self.detect_sensitive_lowered(email_body.lower(), email_subject.lower())
+    
+    def detect_sensitive_lowered(self, body_lower: str, subject_lower: str = "",
+                                 full_lower: Optional[str] = None) -> Dict[str, Any]:
+        """
+        detect_sensitive_content() for an already lowercased body/subject
         
-        full_text = f"{email_subject} {email_body}".lower()
+        full_lower, if given, is the caller's f"{subject_lower} {body_lower}".
+        """
+        cache_key = self._cache.make_key(subject_lower, body_lower)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        started = time.perf_counter()
+        result = self._detect(body_lower, subject_lower, full_lower)
+        self._cache.put(cache_key, result, time.perf_counter() - started)
+        return result
+    
+    def _detect(self, body_lower: str, subject_lower: str,
+                full_lower: Optional[str]) -> Dict[str, Any]:
+        """Run the keyword scan and risk classification (no caching)"""
+        
+        # Matched keywords by category index, in category order
+        if self._automaton is not None:
+            if full_lower is None:
+                full_lower = f"{subject_lower} {body_lower}"
+            category_matches = self._scan_keywords(full_lower)
+        else:
+            category_matches = self._search_categories(subject_lower, body_lower, full_lower)
         
-        result = {
-            'is_sensitive': False,
-            'categories': [],
-            'matched_keywords': [],
-            'risk_level': 'low',
-            'requires_manual_review': False
-        }
+        if not category_matches:
+            return {**self.NOT_SENSITIVE_RESULT, 'categories': [], 'matched_keywords': []}
         
-        # Check each category
-        for category, pattern in self.sensitive_patterns.items():
-            matches = pattern.findall(full_text)
-            if matches:
-                result['is_sensitive'] = True
-                result['categories'].append(category)
-                result['matched_keywords'].extend(matches)
+        # Keywords go straight into a set - no separate dedup pass
+        categories = []
+        matched_keywords = set()
+        category_mask = 0
+        for index, matches in category_matches.items():
+            category_mask |= 1 << index
+            categories.append(self._categories[index])
+            matched_keywords.update(matches)
         
         # Determine risk level based on categories matched
-        if result['is_sensitive']:
-            critical_categories = {'legal', 'hr_personnel', 'crisis'}
-            high_risk_categories = {'financial_sensitive', 'confidential', 'ethical'}
-            
-            if any(cat in critical_categories for cat in result['categories']):
-                result['risk_level'] = 'critical'
-                result['requires_manual_review'] = True
-            elif any(cat in high_risk_categories for cat in result['categories']):
-                result['risk_level'] = 'high'
-                result['requires_manual_review'] = True
-            else:
-                result['risk_level'] = 'medium'
+        if category_mask & self._critical_mask:
+            risk_level = 'critical'
+        elif category_mask & self._high_risk_mask:
+            risk_level = 'high'
+        else:
+            risk_level = 'medium'
         
-        # Remove duplicates
-        result['matched_keywords'] = list(set(result['matched_keywords']))
+        return {
+            'is_sensitive': True,
+            'categories': categories,
+            'matched_keywords': list(matched_keywords),
+            'risk_level': risk_level,
+            'requires_manual_review': risk_level != 'medium'
+        }
+    
+    def _search_categories(self, subject_lower: str, body_lower: str,
+                           full_lower: Optional[str] = None) -> Dict[int, Collection[str]]:
+        """Run each category regex (only Hyperscan's candidates, when available)"""
+        
+        # The Hyperscan database is case-sensitive ASCII, so it scans casefolded
+        # text (dotless i, long s - see _KEYWORD_CASEFOLD) to see everything
+        # IGNORECASE would match. Its ASCII word boundaries can then only
+        # over-report (every keyword starts and ends with an ASCII letter),
+        # so re stays the judge
+        if self._matcher is not None:
+            candidates = sorted(self._matcher.matching_ids(
+                _casefold_lowered(subject_lower), _casefold_lowered(body_lower)
+            ))
+        else:
+            candidates = range(len(self._categories))
+        
+        if not candidates:
+            return {}
+        
+        full_text = full_lower if full_lower is not None else f"{subject_lower} {body_lower}"
+        
+        # Tokens are built once and shared by every category. Text with
+        # characters that only IGNORECASE folds keeps the full regexes
+        tokens = None
+        if full_text.translate(_KEYWORD_CASEFOLD) == full_text:
+            tokens = set(_WORD_TOKEN_RE.findall(full_text))
+        
+        category_matches = {}
+        for index in candidates:
+            matches = None
+            if tokens is not None:
+                single_hits = self._single_keywords[index] & tokens
+                multi_pattern = self._multi_patterns[index]
+                multi_hits = multi_pattern.findall(full_text) if multi_pattern is not None else []
+                # A single word inside a matched phrase (termination / wrongful
+                # termination) may not count on its own - let the regex decide
+                if not (multi_hits and single_hits & self._multi_words[index]):
+                    matches = single_hits.union(multi_hits)
+            if matches is None:
+                matches = self.sensitive_patterns[self._categories[index]].findall(full_text)
+            if matches:
+                category_matches[index] = matches
+        return category_matches
+    
+    def _scan_keywords(self, full_text: str) -> Dict[int, List[str]]:
+        """
+        Find every category's keywords in one automaton pass
         
-        return result
+        Gives the same matches as the per-category regex findall: word
+        boundaries as in re, and per category the leftmost match wins, ties
+        going to the keyword listed first, with no overlaps.
+        """
+        text = full_text.translate(_KEYWORD_CASEFOLD)
+        last = len(text) - 1
+        
+        hits = [[] for _ in self._categories]  # (start, rank, stop) per category
+        for end, (length, owners) in self._automaton.iter(text):
+            start = end - length + 1
+            if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+                continue
+            if end < last and (text[end + 1].isalnum() or text[end + 1] == '_'):
+                continue
+            for index, rank in owners:
+                hits[index].append((start, rank, end + 1))
+        
+        category_matches = {}
+        for index, category_hits in enumerate(hits):
+            if not category_hits:
+                continue
+            category_hits.sort()
+            matches = []
+            position = 0
+            for start, rank, stop in category_hits:
+                if start >= position:
+                    matches.append(full_text[start:stop])
+                    position = stop
+            category_matches[index] = matches
+        return category_matches
 
 
 # =============================================================================
 # EDGE CASE HANDLER
 # =============================================================================
 
+# ASCII bytes for which str.isalpha() or str.isspace() is true
+_ASCII_MEANINGFUL_BYTES = bytes(b for b in range(128) if chr(b).isalpha() or chr(b).isspace())
+
+# Runs of ASCII characters, stripped to leave only the non-ASCII ones
+_ASCII_RUN_RE = re.compile('[\x00-\x7f]+')
+
 class EdgeCaseHandler:
     """
     Handles edge cases in email reply generation
     """
     
+    __slots__ = ('_cache',)
+    
+    # Define thresholds
+    min_body_length = 10  # Too short to analyze
+    max_body_length = 10000  # Too long, might be spam
+    min_meaningful_words = 3  # Minimum words to be meaningful
+    
+    # Common no-reply patterns, searched as one alternation
+    no_reply_patterns = (
+        r'do not reply',
+        r'no-reply',
+        r'noreply',
+        r'automated message',
+        r'automatic notification',
+        r'unsubscribe',
+        r'this is an automated'
+    )
+    _no_reply_re = re.compile(
+        '|'.join(f'(?:{p})' for p in no_reply_patterns), re.IGNORECASE
+    )
+    
+    # Result when no edge case applies (the common case)
+    NO_EDGE_CASE_RESULT = {
+        'is_edge_case': False,
+        'edge_case_type': None,
+        'should_generate_reply': True,
+        'recommendation': ''
+    }
+    
     def __init__(self):
         """Initialize edge case handler"""
-        print("[INFO] Initializing Edge Case Handler...")
-        
-        # Define thresholds
-        self.min_body_length = 10  # Too short to analyze
-        self.max_body_length = 10000  # Too long, might be spam
-        self.min_meaningful_words = 3  # Minimum words to be meaningful
-        
-        # Common no-reply patterns
-        self.no_reply_patterns = [
-            r'do not reply',
-            r'no-reply',
-            r'noreply',
-            r'automated message',
-            r'automatic notification',
-            r'unsubscribe',
-            r'this is an automated'
-        ]
+        logger.info("Initializing Edge Case Handler...")
+        
+        # Results for repeated (e.g. quoted/threaded) emails; checks that took
+        # under 0.2ms aren't worth a slot
+        self._cache = AnalysisCache(min_compute_seconds=0.0002)
         
-        print("[OK] Edge case handler ready")
+        logger.info("Edge case handler ready")
     
     def analyze_email(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -222,18 +808,38 @@ class EdgeCaseHandler:
         """
         
         body = email_data.get('body', '')
-        subject = email_data.get('subject', '')
-        sender = email_data.get('sender', '')
+        return self.analyze_lowered(
+            body,
+            email_data.get('subject', '').lower(),
+            body.lower(),
+            email_data.get('sender', '').lower()
+        )
+    
+    def analyze_lowered(self, body: str, subject_lower: str, body_lower: str,
+                        sender_lower: str, full_lower: Optional[str] = None) -> Dict[str, Any]:
+        """
+        analyze_email() with the subject/body/sender already lowercased
         
-        result = {
-            'is_edge_case': False,
-            'edge_case_type': None,
-            'should_generate_reply': True,
-            'recommendation': ''
-        }
+        full_lower, if given, is the caller's f"{subject_lower} {body_lower}".
+        """
+        cache_key = self._cache.make_key(body, subject_lower, sender_lower)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        started = time.perf_counter()
+        result = self._analyze(body, subject_lower, body_lower, sender_lower, full_lower)
+        self._cache.put(cache_key, result, time.perf_counter() - started)
+        return result
+    
+    def _analyze(self, body: str, subject_lower: str, body_lower: str,
+                 sender_lower: str, full_lower: Optional[str]) -> Dict[str, Any]:
+        """Run the edge-case checks (no caching)"""
+        
+        result = dict(self.NO_EDGE_CASE_RESULT)
         
         # Check for no-reply sender
-        if self._is_no_reply_email(sender, subject, body):
+        if self._is_no_reply_lowered(sender_lower, subject_lower, body_lower, full_lower):
             result['is_edge_case'] = True
             result['edge_case_type'] = 'no_reply'
             result['should_generate_reply'] = False
@@ -257,7 +863,7 @@ class EdgeCaseHandler:
             result['recommendation'] = 'Email unusually long. Review for spam or bulk content.'
         
         # Check for unclear content (mostly special characters or numbers)
-        meaningful_chars = sum(c.isalpha() or c.isspace() for c in body)
+        meaningful_chars = self._count_meaningful_chars(body)
         if len(body) > 0 and meaningful_chars / len(body) < 0.5:
             result['is_edge_case'] = True
             result['edge_case_type'] = 'unclear'
@@ -265,103 +871,233 @@ class EdgeCaseHandler:
             result['recommendation'] = 'Email content unclear or contains mostly non-text characters.'
             return result
         
-        # Check for multiple disparate topics (heuristic: many sentences with different main subjects)
-        sentences = body.split('.')
-        if len(sentences) > 10:
+        # Check for multiple disparate topics (heuristic: many sentences with different main subjects),
+        # i.e. more than 10 '.'-separated parts - counted without splitting
+        if body.count('.') >= 10:
             result['is_edge_case'] = True
             result['edge_case_type'] = 'multiple_topics'
             result['recommendation'] = 'Email covers many topics. Reply may need manual review.'
         
         return result
     
+    def _count_meaningful_chars(self, body: str) -> int:
+        """Number of letters and whitespace characters in body"""
+        # ASCII characters: delete the meaningful bytes in C and count what
+        # was removed. Only non-ASCII characters need str.isalpha/isspace
+        data = body.encode('ascii', 'ignore')
+        count = len(data) - len(data.translate(None, _ASCII_MEANINGFUL_BYTES))
+        if len(data) != len(body):
+            count += sum(c.isalpha() or c.isspace() for c in _ASCII_RUN_RE.sub('', body))
+        return count
+    
     def _is_no_reply_email(self, sender: str, subject: str, body: str) -> bool:
         """Check if email is from a no-reply address"""
+        return self._is_no_reply_lowered(sender.lower(), subject.lower(), body.lower())
+    
+    def _is_no_reply_lowered(self, sender_lower: str, subject_lower: str, body_lower: str,
+                             full_lower: Optional[str] = None) -> bool:
+        """_is_no_reply_email() for already lowercased sender/subject/body"""
         
         # Check sender
-        sender_lower = sender.lower()
         if 'noreply' in sender_lower or 'no-reply' in sender_lower:
             return True
         
-        # Check content for no-reply indicators
-        full_text = f"{subject} {body}".lower()
-        for pattern in self.no_reply_patterns:
-            if re.search(pattern, full_text, re.IGNORECASE):
-                return True
-        
-        return False
+        # Check content for no-reply indicators (one combined search)
+        if full_lower is None:
+            full_lower = f"{subject_lower} {body_lower}"
+        return self._no_reply_re.search(full_lower) is not None
 
 
 # =============================================================================
 # REPLY NECESSITY ANALYZER
 # =============================================================================
 
+# Reply-necessity patterns by email type (matched against lowercased text)
+_REPLY_NECESSITY_PATTERNS = {
+    'announcement': [
+        r'\b(save the date|mark your calendar|join us|we\'re (excited|pleased|happy) to announce)\b',
+        r'\b(upcoming event|event details|event information|registration (is|now) open)\b',
+        r'\b(don\'t miss|see you (there|soon)|looking forward to seeing you)\b',
+        r'\b(venue|date and time|event agenda|speakers include)\b'
+    ],
+    'notification': [
+        r'\b(your .{1,120}? has been|confirmation of|receipt for|thank you for your)\b',
+        r'\b(this is (a|an) (automated|automatic) (message|email|notification))\b',
+        r'\b(you (have|\'ve) successfully|your (order|payment|subscription|registration))\b',
+        r'\b(status update|activity notification|alert)\b'
+    ],
+    'marketing': [
+        r'\b(exclusive offer|limited time|special (deal|offer|promotion))\b',
+        r'\b(discover|explore|shop now|buy now|get started|learn more)\b',
+        r'\b(new (features|products|services|arrivals)|introducing)\b',
+        r'\b(don\'t miss out|act now|hurry|ends soon)\b',
+        r'\bunsubscribe\b'
+    ],
+    'newsletter': [
+        r'\b(newsletter|digest|weekly (update|roundup)|monthly (update|roundup))\b',
+        r'\b(in this (issue|edition)|this (week|month)\'s)\b',
+        r'\b(subscriber|subscription)\b'
+    ],
+    'invitation': [
+        r'\b(you\'re invited|invitation to|rsvp|please join us)\b',
+        r'\b(will you (be|join)|can you (attend|make it|join))\b'
+    ],
+    'transactional': [
+        r'\b(receipt|invoice|order confirmation|payment (received|confirmed))\b',
+        r'\b(transaction (complete|successful)|your purchase)\b'
+    ],
+    'security_alert': [
+        r'\b(security alert|suspicious activity|unusual (login|activity))\b',
+        r'\b(password reset|verify your|action required|immediate action)\b',
+        r'\b(detected|exposed|breach|unauthorized)\b'
+    ]
+}
+
+# Compiled once at import and shared by every analyzer instance (no IGNORECASE -
+# analyze_lowered passes lowered, _casefold_lowered text)
+_COMPILED_NECESSITY_PATTERNS = {
+    category: [re.compile(p) for p in patterns]
+    for category, patterns in _REPLY_NECESSITY_PATTERNS.items()
+}
+
+# Each category's patterns as one alternation - a single search per text
+# answers "does any pattern of this category match?"
+_COMBINED_NECESSITY_PATTERNS = {
+    category: re.compile('|'.join(f'(?:{p})' for p in patterns))
+    for category, patterns in _REPLY_NECESSITY_PATTERNS.items()
+}
+
+# Pattern categories in precedence order - the first match decides the intent
+_NECESSITY_PRIORITY = (
+    'security_alert',   # Action needed, but don't reply
+    'transactional',    # Receipts, confirmations
+    'marketing',
+    'newsletter',
+    'announcement',
+    'invitation',       # Optional reply - RSVP
+    'notification'
+)
+
+# All patterns in one Hyperscan database, ids in precedence order - the lowest
+# matching id belongs to the winning category. Subject and body are scanned as
+# f"{subject} {body}", so phrases can match across the two
+_NECESSITY_MATCHER = HyperscanMatcher.create(
+    [p for category in _NECESSITY_PRIORITY for p in _REPLY_NECESSITY_PATTERNS[category]]
+)
+_NECESSITY_PATTERN_CATEGORIES = [
+    category
+    for category in _NECESSITY_PRIORITY
+    for _ in _REPLY_NECESSITY_PATTERNS[category]
+]
+_NECESSITY_TOP_PATTERN_COUNT = len(_REPLY_NECESSITY_PATTERNS[_NECESSITY_PRIORITY[0]])
+
+
 class ReplyNecessityAnalyzer:
     """
     Determines if an email actually needs a reply based on email type,
     sender patterns, content patterns, and call-to-action presence.
     """
     
+    __slots__ = ('_cache',)
+    
+    # Shared compiled patterns (see _COMPILED_NECESSITY_PATTERNS)
+    compiled_patterns = _COMPILED_NECESSITY_PATTERNS
+    combined_patterns = _COMBINED_NECESSITY_PATTERNS
+    
+    # Single-scan Hyperscan matcher (None when hyperscan isn't installed)
+    _matcher = _NECESSITY_MATCHER
+    
+    # Pattern categories in precedence order - the first match decides the intent
+    CATEGORY_PRIORITY = _NECESSITY_PRIORITY
+    
+    # Result for automated senders (noreply@, no-reply@, donotreply@)
+    NO_REPLY_SENDER_RESULT = {
+        'needs_reply': False,
+        'necessity_level': 'not_needed',
+        'email_intent': 'automated',
+        'reason': 'Automated email from no-reply address',
+        'suggested_action': 'Mark as read'
+    }
+    
+    # Result for emails with direct questions or action requests
+    REQUEST_RESULT = {
+        'needs_reply': True,
+        'necessity_level': 'required',
+        'email_intent': 'request',
+        'reason': 'Contains direct questions or action requests',
+        'suggested_action': 'Reply with answers or confirmation'
+    }
+    
+    # Default: optional reply for general emails
+    GENERAL_RESULT = {
+        'needs_reply': True,
+        'necessity_level': 'optional',
+        'email_intent': 'general',
+        'reason': 'General communication',
+        'suggested_action': 'Reply if needed'
+    }
+    
+    # Result fields for each pattern category
+    CATEGORY_RESULTS = {
+        'security_alert': {
+            'needs_reply': False,
+            'necessity_level': 'action_only',
+            'email_intent': 'security_alert',
+            'reason': 'Security alert requiring action on platform, not email reply',
+            'suggested_action': 'Take action on the platform (e.g., GitHub, etc.)'
+        },
+        'transactional': {
+            'needs_reply': False,
+            'necessity_level': 'not_needed',
+            'email_intent': 'transactional',
+            'reason': 'Automated transaction confirmation',
+            'suggested_action': 'File for records'
+        },
+        'marketing': {
+            'needs_reply': False,
+            'necessity_level': 'not_needed',
+            'email_intent': 'marketing',
+            'reason': 'Marketing/promotional content',
+            'suggested_action': 'Review offers or unsubscribe'
+        },
+        'newsletter': {
+            'needs_reply': False,
+            'necessity_level': 'not_needed',
+            'email_intent': 'newsletter',
+            'reason': 'Newsletter or periodic update',
+            'suggested_action': 'Read and archive'
+        },
+        'announcement': {
+            'needs_reply': False,
+            'necessity_level': 'optional',
+            'email_intent': 'announcement',
+            'reason': 'Event announcement or update',
+            'suggested_action': 'Add to calendar or acknowledge if interested'
+        },
+        'invitation': {
+            'needs_reply': True,
+            'necessity_level': 'optional',
+            'email_intent': 'invitation',
+            'reason': 'Event invitation - RSVP if attending',
+            'suggested_action': 'RSVP or add to calendar'
+        },
+        'notification': {
+            'needs_reply': False,
+            'necessity_level': 'not_needed',
+            'email_intent': 'notification',
+            'reason': 'Automated notification',
+            'suggested_action': 'Review and mark as read'
+        }
+    }
+    
     def __init__(self):
         """Initialize reply necessity analyzer"""
-        print("[INFO] Initializing Reply Necessity Analyzer...")
-        
-        # Patterns for different email types
-        self.announcement_patterns = [
-            r'\b(save the date|mark your calendar|join us|we\'re (excited|pleased|happy) to announce)\b',
-            r'\b(upcoming event|event details|event information|registration (is|now) open)\b',
-            r'\b(don\'t miss|see you (there|soon)|looking forward to seeing you)\b',
-            r'\b(venue|date and time|event agenda|speakers include)\b'
-        ]
+        logger.info("Initializing Reply Necessity Analyzer...")
         
-        self.notification_patterns = [
-            r'\b(your .+ has been|confirmation of|receipt for|thank you for your)\b',
-            r'\b(this is (a|an) (automated|automatic) (message|email|notification))\b',
-            r'\b(you (have|\'ve) successfully|your (order|payment|subscription|registration))\b',
-            r'\b(status update|activity notification|alert)\b'
-        ]
+        # Results for repeated (e.g. quoted/threaded) emails
+        self._cache = AnalysisCache()
         
-        self.marketing_patterns = [
-            r'\b(exclusive offer|limited time|special (deal|offer|promotion))\b',
-            r'\b(discover|explore|shop now|buy now|get started|learn more)\b',
-            r'\b(new (features|products|services|arrivals)|introducing)\b',
-            r'\b(don\'t miss out|act now|hurry|ends soon)\b',
-            r'\bunsubscribe\b'
-        ]
-        
-        self.newsletter_patterns = [
-            r'\b(newsletter|digest|weekly (update|roundup)|monthly (update|roundup))\b',
-            r'\b(in this (issue|edition)|this (week|month)\'s)\b',
-            r'\b(subscriber|subscription)\b'
-        ]
-        
-        self.invitation_patterns = [
-            r'\b(you\'re invited|invitation to|rsvp|please join us)\b',
-            r'\b(will you (be|join)|can you (attend|make it|join))\b'
-        ]
-        
-        self.transactional_patterns = [
-            r'\b(receipt|invoice|order confirmation|payment (received|confirmed))\b',
-            r'\b(transaction (complete|successful)|your purchase)\b'
-        ]
-        
-        self.security_alert_patterns = [
-            r'\b(security alert|suspicious activity|unusual (login|activity))\b',
-            r'\b(password reset|verify your|action required|immediate action)\b',
-            r'\b(detected|exposed|breach|unauthorized)\b'
-        ]
-        
-        # Compile patterns for performance
-        self.compiled_patterns = {
-            'announcement': [re.compile(p, re.IGNORECASE) for p in self.announcement_patterns],
-            'notification': [re.compile(p, re.IGNORECASE) for p in self.notification_patterns],
-            'marketing': [re.compile(p, re.IGNORECASE) for p in self.marketing_patterns],
-            'newsletter': [re.compile(p, re.IGNORECASE) for p in self.newsletter_patterns],
-            'invitation': [re.compile(p, re.IGNORECASE) for p in self.invitation_patterns],
-            'transactional': [re.compile(p, re.IGNORECASE) for p in self.transactional_patterns],
-            'security_alert': [re.compile(p, re.IGNORECASE) for p in self.security_alert_patterns]
-        }
-        
-        print("[OK] Reply necessity analyzer ready")
+        logger.info("Reply necessity analyzer ready")
     
     def analyze_reply_necessity(self, email_data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -377,184 +1113,419 @@ class ReplyNecessityAnalyzer:
             }
         """
         
-        subject = email_data.get('subject', '').lower()
-        body = email_data.get('body', '').lower()
-        sender = email_data.get('sender_email', '').lower()
-        full_text = f"{subject} {body}"
-        
-        result = {
-            'needs_reply': True,
-            'necessity_level': 'optional',
-            'email_intent': 'general',
-            'reason': '',
-            'suggested_action': 'Review and decide'
-        }
+        return self.analyze_lowered(
+            email_data.get('subject', '').lower(),
+            email_data.get('body', '').lower(),
+            email_data.get('sender_email', '').lower(),
+            context
+        )
+    
+    def analyze_lowered(self, subject: str, body: str, sender: str,
+                        context: Dict[str, Any]) -> Dict[str, Any]:
+        """analyze_reply_necessity() for an already lowercased subject/body/sender"""
         
-        # Check for automated/no-reply senders
+        # Check for automated/no-reply senders first - cheaper than hashing
+        # the text for the cache key, and no pattern can change the answer
         if 'noreply' in sender or 'no-reply' in sender or 'donotreply' in sender:
-            result['needs_reply'] = False
-            result['necessity_level'] = 'not_needed'
-            result['email_intent'] = 'automated'
-            result['reason'] = 'Automated email from no-reply address'
-            result['suggested_action'] = 'Mark as read'
-            return result
-        
-        # Check for security alerts (action needed, but don't reply)
-        if self._matches_patterns(full_text, 'security_alert'):
-            result['needs_reply'] = False
-            result['necessity_level'] = 'action_only'
-            result['email_intent'] = 'security_alert'
-            result['reason'] = 'Security alert requiring action on platform, not email reply'
-            result['suggested_action'] = 'Take action on the platform (e.g., GitHub, etc.)'
-            return result
-        
-        # Check for transactional emails (receipts, confirmations)
-        if self._matches_patterns(full_text, 'transactional'):
-            result['needs_reply'] = False
-            result['necessity_level'] = 'not_needed'
-            result['email_intent'] = 'transactional'
-            result['reason'] = 'Automated transaction confirmation'
-            result['suggested_action'] = 'File for records'
-            return result
-        
-        # Check for marketing emails
-        if self._matches_patterns(full_text, 'marketing'):
-            result['needs_reply'] = False
-            result['necessity_level'] = 'not_needed'
-            result['email_intent'] = 'marketing'
-            result['reason'] = 'Marketing/promotional content'
-            result['suggested_action'] = 'Review offers or unsubscribe'
-            return result
-        
-        # Check for newsletters
-        if self._matches_patterns(full_text, 'newsletter'):
-            result['needs_reply'] = False
-            result['necessity_level'] = 'not_needed'
-            result['email_intent'] = 'newsletter'
-            result['reason'] = 'Newsletter or periodic update'
-            result['suggested_action'] = 'Read and archive'
-            return result
-        
-        # Check for announcements
-        if self._matches_patterns(full_text, 'announcement'):
-            result['needs_reply'] = False
-            result['necessity_level'] = 'optional'
-            result['email_intent'] = 'announcement'
-            result['reason'] = 'Event announcement or update'
-            result['suggested_action'] = 'Add to calendar or acknowledge if interested'
-            return result
+            return dict(self.NO_REPLY_SENDER_RESULT)
+        
+        # The patterns are compiled without IGNORECASE
+        subject = _casefold_lowered(subject)
+        body = _casefold_lowered(body)
+        
+        # The result only depends on the text, sender and these context signals
+        cache_key = self._cache.make_key(
+            subject, body, sender,
+            bool(context.get('questions')),
+            bool(context.get('action_items')),
+            context.get('email_category', 'general')
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Check for invitations (optional reply - RSVP)
-        if self._matches_patterns(full_text, 'invitation'):
-            result['needs_reply'] = True
-            result['necessity_level'] = 'optional'
-            result['email_intent'] = 'invitation'
-            result['reason'] = 'Event invitation - RSVP if attending'
-            result['suggested_action'] = 'RSVP or add to calendar'
-            return result
+        result = self._analyze(subject, body, sender, context)
+        self._cache.put(cache_key, result)
+        return result
+    
+    def _analyze(self, subject: str, body: str, sender: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the content checks on lowercased subject/body (no-reply senders already handled)"""
         
-        # Check for notifications
-        if self._matches_patterns(full_text, 'notification'):
-            result['needs_reply'] = False
-            result['necessity_level'] = 'not_needed'
-            result['email_intent'] = 'notification'
-            result['reason'] = 'Automated notification'
-            result['suggested_action'] = 'Review and mark as read'
-            return result
+        # Check pattern categories in precedence order (security alerts first)
+        matched_category = self._first_matching_category(subject, body)
+        if matched_category:
+            return dict(self.CATEGORY_RESULTS[matched_category])
         
         # Check context for direct questions or requests
-        has_questions = len(context.get('questions', [])) > 0
-        has_action_items = len(context.get('action_items', [])) > 0
-        
-        if has_questions or has_action_items:
-            result['needs_reply'] = True
-            result['necessity_level'] = 'required'
-            result['email_intent'] = 'request'
-            result['reason'] = 'Contains direct questions or action requests'
-            result['suggested_action'] = 'Reply with answers or confirmation'
-            return result
+        if context.get('questions') or context.get('action_items'):
+            return dict(self.REQUEST_RESULT)
         
         # Check email category from context
         email_category = context.get('email_category', 'general')
-        if email_category in ['question', 'info_request', 'problem_report']:
-            result['needs_reply'] = True
-            result['necessity_level'] = 'required'
-            result['email_intent'] = email_category
-            result['reason'] = f'Email is a {email_category.replace("_", " ")}'
-            result['suggested_action'] = 'Reply with response'
-            return result
+        if email_category in ('question', 'info_request', 'problem_report'):
+            return {
+                'needs_reply': True,
+                'necessity_level': 'required',
+                'email_intent': email_category,
+                'reason': f'Email is a {email_category.replace("_", " ")}',
+                'suggested_action': 'Reply with response'
+            }
         
-        # Default: optional reply for general emails
-        result['needs_reply'] = True
-        result['necessity_level'] = 'optional'
-        result['email_intent'] = 'general'
-        result['reason'] = 'General communication'
-        result['suggested_action'] = 'Reply if needed'
-        return result
+        return dict(self.GENERAL_RESULT)
+    
+    def _first_matching_category(self, subject: str, body: str) -> Optional[str]:
+        """Return the highest-priority pattern category matched by the email, if any"""
+        categories = self.CATEGORY_PRIORITY
+        if self._matcher is not None:
+            # One vectored scan over subject and body for the lowest matching
+            # pattern id; a top-priority (security alert) match ends it early
+            pattern_id = self._matcher.lowest_matching_id(
+                subject, body, stop_below=_NECESSITY_TOP_PATTERN_COUNT
+            )
+            if pattern_id is None:
+                return None
+            # Hyperscan's ASCII word boundaries can only over-report (e.g.
+            # 'receipt' in 'éreceipt'), so no earlier category can match and
+            # re confirms from this one on
+            categories = categories[categories.index(_NECESSITY_PATTERN_CATEGORIES[pattern_id]):]
+        
+        full_text = f"{subject} {body}"
+        for category in categories:
+            if self._matches_patterns(full_text, category):
+                return category
+        return None
     
     def _matches_patterns(self, text: str, pattern_type: str) -> bool:
         """Check if text matches any pattern of given type"""
-        patterns = self.compiled_patterns.get(pattern_type, [])
-        return any(pattern.search(text) for pattern in patterns)
+        pattern = self.combined_patterns.get(pattern_type)
+        if pattern is None:
+            return False
+        return pattern.search(text) is not None
 
 
 # =============================================================================
 # EMAIL CONTEXT EXTRACTOR
 # =============================================================================
 
+# Context extraction patterns, compiled once at import
+
+# Question patterns
+_QUESTION_PATTERNS = [
+    re.compile(r'\b(what|when|where|who|why|how|which|can you|could you|would you|will you)\b.*\?', re.IGNORECASE),
+    re.compile(r'\b(please|kindly)\s+(provide|send|share|let me know|tell me|explain)', re.IGNORECASE),
+]
+
+# Action item patterns (matched against _casefold_lowered text - no IGNORECASE needed)
+_ACTION_PATTERNS = [
+    re.compile(r'\b(need|require|request|want|looking for|asking for)\b.*'),
+    re.compile(r'\b(please|kindly)\s+\w+'),
+    re.compile(r'\b(can you|could you|would you)\s+\w+'),
+]
+
+# Deadline patterns (matched against _casefold_lowered text - no IGNORECASE needed)
+_DEADLINE_PATTERNS = [
+    re.compile(r'\b(by|before|until|deadline|due)\s+(today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,2}[/-]\d{1,2})'),
+    re.compile(r'\b(asap|urgent|immediately|right away|as soon as possible)\b'),
+    re.compile(r'\b(this|next)\s+(week|month|quarter)'),
+]
+
+
+def _question_segments(text: str) -> Iterator[str]:
+    """
+    The '.'-separated segments of text that contain a '?', in order - the
+    same as [s for s in text.split('.') if '?' in s], but found lazily with
+    str.find so callers can stop early
+    """
+    position = text.find('?')
+    while position >= 0:
+        start = text.rfind('.', 0, position) + 1
+        end = text.find('.', position)
+        if end < 0:
+            end = len(text)
+        yield text[start:end]
+        position = text.find('?', end)
+
+
+# Attachment references
+_ATTACHMENT_PATTERNS = [
+    re.compile(r'\b(attached|attachment|attached file|see attached|find attached)\b', re.IGNORECASE),
+    re.compile(r'\b(document|file|spreadsheet|pdf|report|presentation)\b', re.IGNORECASE),
+]
+
+# Predicate patterns, matched against lowercased text
+
+# Questions directed at the user
+_USER_DIRECTED_PATTERNS = [
+    r'\b(can you|could you|would you|will you|do you|did you|have you|are you)\b',
+    r'\b(your|you\'re|you\'ll|you\'ve)\b',
+    r'\b(what (do|did|will) you|when (do|did|will) you|where (do|did|will) you|how (do|did|will) you|why (do|did|will) you)\b',
+    r'\b(please (let|tell|send|provide|confirm|advise))\b',
+    r'\b(need (you to|your))\b',
+]
+
+# Rhetorical questions
+_RHETORICAL_PATTERNS = [
+    r'\b(isn\'t (it|that) (great|amazing|wonderful|exciting))\b',
+    r'\b(who doesn\'t (love|want|like))\b',
+    r'\b(what could be (better|more))\b',
+    r'\b(right\?|correct\?)$',  # Questions ending with "right?" or "correct?"
+]
+
+# Requests for the user to act
+_USER_REQUEST_PATTERNS = [
+    r'\b(please|kindly|could you|can you|would you) (upload|send|provide|submit|complete|review|confirm|fill|click)\b',
+    r'\b(you (need|must|should|have) to|you\'ll need to)\b',
+    r'\b(to (get|proceed|continue|register|attend), (please|kindly|you need to|you must))\b',
+    r'\b(action (required|needed)|require (your|you to))\b',
+]
+
+# The sender's own actions ("I will" statements), not the user's
+_SENDER_ACTION_PATTERNS = [
+    r'\b(i will|i\'ll|we will|we\'ll|i am|i\'m|we are|we\'re)\b',
+    r'\b(has been|have been|was|were) (sent|completed|updated|processed)\b',
+]
+
+# Actions already completed (past tense)
+_PAST_ACTION_PATTERNS = [
+    r'\b(has been|have been|was|were) (sent|completed|updated|processed|uploaded|submitted)\b',
+    r'\b(sent|completed|updated|processed|uploaded|submitted|registered|confirmed) (on|at|yesterday|last)\b',
+    r'\b(already|previously) (sent|completed|updated|processed)\b',
+]
+
+# Each predicate's patterns as one alternation - a single search answers
+# "does any of them match?"
+_USER_DIRECTED_RE = re.compile('|'.join(f'(?:{p})' for p in _USER_DIRECTED_PATTERNS))
+_RHETORICAL_RE = re.compile('|'.join(f'(?:{p})' for p in _RHETORICAL_PATTERNS))
+_USER_REQUEST_RE = re.compile('|'.join(f'(?:{p})' for p in _USER_REQUEST_PATTERNS))
+_SENDER_ACTION_RE = re.compile('|'.join(f'(?:{p})' for p in _SENDER_ACTION_PATTERNS))
+_PAST_ACTION_RE = re.compile('|'.join(f'(?:{p})' for p in _PAST_ACTION_PATTERNS))
+
+# Quoted text or emphasized (ALL CAPS) words
+_KEY_PHRASE_RE = re.compile(r'"(?P<quoted>[^"]+)"|(?P<caps>\b[A-Z]{4,}\b)')
+
+
+@dataclass(slots=True)
+class EmailContext:
+    """
+    Per-email context filled in by EmailContextExtractor
+    
+    Slotted fields keep the per-email struct small while it is being
+    populated; to_dict() gives the dict shape the rest of the pipeline uses.
+    """
+    
+    sender_name: str = 'there'
+    subject: str = ''
+    main_topic: str = ''
+    
+    # Named entities (see ENTITY_FIELDS)
+    people: List[str] = field(default_factory=list)
+    organizations: List[str] = field(default_factory=list)
+    dates: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    money: List[str] = field(default_factory=list)
+    
+    questions: List[str] = field(default_factory=list)
+    action_items: List[str] = field(default_factory=list)
+    deadlines: List[str] = field(default_factory=list)
+    has_attachments: bool = False
+    attachment_count: int = 0
+    urgency_level: str = 'normal'
+    email_category: str = 'general'
+    key_phrases: List[str] = field(default_factory=list)
+    extracted_successfully: bool = False
+    
+    ENTITY_FIELDS: ClassVar[Tuple[str, ...]] = ('people', 'organizations', 'dates', 'locations', 'money')
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the context dict consumed by the reply pipeline"""
+        return {
+            'sender_name': self.sender_name,
+            'subject': self.subject,
+            'main_topic': self.main_topic,
+            'entities': {
+                'people': self.people,
+                'organizations': self.organizations,
+                'dates': self.dates,
+                'locations': self.locations,
+                'money': self.money
+            },
+            'questions': self.questions,
+            'action_items': self.action_items,
+            'deadlines': self.deadlines,
+            'has_attachments': self.has_attachments,
+            'attachment_count': self.attachment_count,
+            'urgency_level': self.urgency_level,
+            'email_category': self.email_category,
+            'key_phrases': self.key_phrases,
+            'extracted_successfully': self.extracted_successfully
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_group_automaton(groups: Tuple[Tuple[bytes, ...], ...]):
+    """
+    Aho-Corasick automaton over groups of ASCII keywords, shared by all
+    extractors (None when pyahocorasick isn't installed)
+    
+    Each keyword maps to the bitmask of the groups (by position) it is in.
+    """
+    if ahocorasick is None:
+        return None
+    
+    group_bits = {}
+    for index, keywords in enumerate(groups):
+        for keyword in keywords:
+            keyword = keyword.decode('ascii')
+            group_bits[keyword] = group_bits.get(keyword, 0) | (1 << index)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, bits in group_bits.items():
+        automaton.add_word(keyword, bits)
+    automaton.make_automaton()
+    return automaton
+
+
+# Only doc.ents is read, so everything but NER (and its tok2vec) is left out
+_SPACY_DISABLED_PIPES = ('tagger', 'parser', 'attribute_ruler', 'lemmatizer')
+
+
+def _get_nlp():
+    """Load the spaCy model once per process (None if it can't be loaded)"""
+    with _MODELS_LOCK:
+        if 'spacy' not in _MODELS:
+            try:
+                _MODELS['spacy'] = spacy.load("en_core_web_sm", disable=list(_SPACY_DISABLED_PIPES))
+                logger.info("spaCy model loaded for entity extraction (pipes: %s)",
+                            ', '.join(_MODELS['spacy'].pipe_names))
+            except Exception as e:
+                logger.error("Failed to load spaCy: %s", e)
+                _MODELS['spacy'] = None
+        return _MODELS['spacy']
+
+
 class EmailContextExtractor:
     """
     Extracts rich context from emails using spaCy and pattern matching
     """
     
+    # Reply/forward prefixes stripped from subjects (lowercase)
+    SUBJECT_PREFIXES = ('re:', 'fwd:', 'fw:')
+    
+    # Imperative sentences often start with these verbs (prefix match on the
+    # first word, so e.g. "uploading" and "call" both count)
+    IMPERATIVE_STARTS = (
+        'upload', 'send', 'provide', 'submit', 'complete', 'review', 'confirm',
+        'fill', 'click', 'download', 'register', 'attend', 'join', 'visit',
+        'check', 'update', 'install', 'contact', 'call', 'email', 'reply'
+    )
+    
+    # Question openings that are usually directed at the recipient (lowercase)
+    DIRECTED_QUESTION_STARTS = (
+        'can you', 'could you', 'would you', 'will you', 'do you', 'did you',
+        'have you', 'are you', 'what would you', 'when can you', 'how can you'
+    )
+    
+    # Category keywords as ASCII bytes - an ASCII needle can only match ASCII
+    # characters in UTF-8, so bytes.find gives the same result as str `in`
+    CATEGORY_KEYWORDS = {
+        'security_alert': (b'security alert', b'suspicious activity', b'detected', b'exposed', b'breach', b'unauthorized'),
+        'transactional': (b'receipt', b'invoice', b'order confirmation', b'payment received', b'transaction complete'),
+        'newsletter': (b'newsletter', b'digest', b'weekly update', b'monthly update', b'subscriber', b'unsubscribe'),
+        'marketing': (b'exclusive offer', b'limited time', b'special deal', b'shop now', b'buy now', b'discover', b'new features'),
+        'announcement': (b'save the date', b'join us', b"we're excited to announce", b'upcoming event', b'event details'),
+        'invitation': (b"you're invited", b'invitation to', b'rsvp', b'please join us', b'can you attend'),
+        'notification': (b'your account', b'has been updated', b'confirmation of', b'status update', b'activity notification'),
+        'notification_action_required': (b'action required', b'please'),
+        'meeting_request': (b'meeting', b'call', b'schedule', b'appointment', b'available'),
+        'problem_report': (b'problem', b'issue', b'error', b'broken', b'bug', b'help', b'support'),
+        'info_request': (b'send', b'provide', b'share', b'need', b'request', b'looking for'),
+        'follow_up': (b'follow up', b'following up', b'checking in', b'status', b'update'),
+        'acknowledgment': (b'thank', b'thanks', b'appreciate', b'grateful'),
+    }
+    URGENT_KEYWORDS = (
+        b'urgent', b'asap', b'emergency', b'critical', b'immediately', b'right away'
+    )
+    
+    # Every keyword group looked up per email, and each group's bit in the
+    # automaton's masks
+    _keyword_groups = {**CATEGORY_KEYWORDS, 'urgent': URGENT_KEYWORDS}
+    _keyword_bits = {group: 1 << i for i, group in enumerate(_keyword_groups)}
+    
+    # spaCy entity labels collected into each EmailContext entity field
+    ENTITY_LABEL_FIELDS = {
+        'PERSON': 'people',
+        'ORG': 'organizations',
+        'DATE': 'dates',
+        'GPE': 'locations',
+        'LOC': 'locations',
+        'MONEY': 'money'
+    }
+    
+    # Automated-mail categories (decided from keywords alone) that rarely get
+    # a drafted reply; spaCy is skipped for them until a reply needs the
+    # entities (see _fill_skipped_entities)
+    NO_ENTITY_CATEGORIES = frozenset({
+        'newsletter', 'marketing', 'transactional', 'notification', 'announcement'
+    })
+    
+    # Characters of "subject body" passed to spaCy (see _entity_text)
+    NER_MAX_CHARS = 5000
+    
     def __init__(self):
         """Initialize the context extractor"""
-        print("[INFO] Initializing Email Context Extractor...")
-        
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-            print("[OK] spaCy model loaded for entity extraction")
-        except Exception as e:
-            print(f"[ERROR] Failed to load spaCy: {e}")
-            self.nlp = None
+        logger.info("Initializing Email Context Extractor...")
         
         # Initialize pattern matchers
         self._initialize_patterns()
         
-    def _initialize_patterns(self):
-        """Initialize regex patterns for context extraction"""
+        # Contexts for repeated (e.g. quoted/threaded) emails; contexts that
+        # took under 1ms to build aren't worth a slot
+        self._cache = AnalysisCache(min_compute_seconds=0.001)
         
-        # Question patterns
-        self.question_patterns = [
-            r'\b(what|when|where|who|why|how|which|can you|could you|would you|will you)\b.*\?',
-            r'\b(please|kindly)\s+(provide|send|share|let me know|tell me|explain)',
-        ]
+        # Entities by spaCy input text - the same text can come with a
+        # different sender or priority, which misses the context cache
+        self._entity_cache = AnalysisCache(maxsize=1024)
         
-        # Action item patterns
-        self.action_patterns = [
-            r'\b(need|require|request|want|looking for|asking for)\b.*',
-            r'\b(please|kindly)\s+\w+',
-            r'\b(can you|could you|would you)\s+\w+',
-        ]
-        
-        # Deadline patterns
-        self.deadline_patterns = [
-            r'\b(by|before|until|deadline|due)\s+(today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,2}[/-]\d{1,2})',
-            r'\b(asap|urgent|immediately|right away|as soon as possible)\b',
-            r'\b(this|next)\s+(week|month|quarter)',
-        ]
-        
-        # Attachment references
-        self.attachment_patterns = [
-            r'\b(attached|attachment|attached file|see attached|find attached)\b',
-            r'\b(document|file|spreadsheet|pdf|report|presentation)\b',
-        ]
+    @functools.cached_property
+    def nlp(self):
+        """spaCy model, loaded on first use and shared between extractors"""
+        return _get_nlp()
+    
+    @functools.cached_property
+    def _entity_label_fields(self) -> Dict[int, str]:
+        """
+        Entity label ID (spaCy string hash) -> EmailContext field, so the
+        entity loop compares ints instead of resolving ent.label_ strings
+        """
+        if self.nlp is None:
+            return {}
+        return {
+            self.nlp.vocab.strings.add(label): field_name
+            for label, field_name in self.ENTITY_LABEL_FIELDS.items()
+        }
+    
+    def _initialize_patterns(self):
+        """Bind the shared compiled patterns for context extraction"""
+        self.question_patterns = _QUESTION_PATTERNS
+        self.action_patterns = _ACTION_PATTERNS
+        self.deadline_patterns = _DEADLINE_PATTERNS
+        self.attachment_patterns = _ATTACHMENT_PATTERNS
+        self.user_directed_re = _USER_DIRECTED_RE
+        self.rhetorical_re = _RHETORICAL_RE
+        self.user_request_re = _USER_REQUEST_RE
+        self.sender_action_re = _SENDER_ACTION_RE
+        self.past_action_re = _PAST_ACTION_RE
+        
+        # With pyahocorasick, one pass finds every keyword group
+        self._keyword_automaton = _keyword_group_automaton(tuple(self._keyword_groups.values()))
     
     def extract_context(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract comprehensive context from email
         
+        spaCy is skipped for automated mail (NO_ENTITY_CATEGORIES), whose
+        entity lists stay empty.
+        
         Args:
             email_data: Email data dictionary with subject, body, sender info
             
@@ -562,116 +1533,259 @@ class EmailContextExtractor:
             Dict with extracted context including entities, topics, questions, etc.
         """
         
-        print("[INFO] Extracting email context...")
+        return self._extract_context_view(_EmailView.from_dict(email_data))
+    
+    def _extract_context_view(self, view: _EmailView) -> Dict[str, Any]:
+        """extract_context() for an email that is already wrapped in a view"""
+        logger.debug("Extracting email context...")
         
-        subject = email_data.get('subject', '')
-        body = email_data.get('body', '')
-        sender_name = email_data.get('sender_name', 'there')
+        cache_key = self._context_cache_key(view)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Combine for analysis
-        full_text = f"{subject} {body}"
+        return self._build_context(view, cache_key)
+    
+    def extract_context_many(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract context for a batch of emails
         
-        context = {
-            'sender_name': sender_name,
-            'subject': subject,
-            'main_topic': '',
-            'entities': {
-                'people': [],
-                'organizations': [],
-                'dates': [],
-                'locations': [],
-                'money': []
-            },
-            'questions': [],
-            'action_items': [],
-            'deadlines': [],
-            'has_attachments': email_data.get('has_attachments', False),
-            'attachment_count': email_data.get('attachment_count', 0),
-            'urgency_level': 'normal',
-            'email_category': 'general',
-            'key_phrases': [],
-            'extracted_successfully': False
-        }
+        spaCy runs over all uncached emails through nlp.pipe, which batches
+        the pipeline work instead of processing one document per call.
+        
+        Args:
+            emails: List of email data dictionaries
+            
+        Returns:
+            List of context dicts, in the same order as emails
+        """
+        return self._extract_context_views([_EmailView.from_dict(email_data) for email_data in emails])
+    
+    def _extract_context_views(self, views: List[_EmailView]) -> List[Dict[str, Any]]:
+        """extract_context_many over already-built email views"""
+        
+        logger.debug("Extracting context for %s emails...", len(views))
+        
+        contexts = [None] * len(views)
+        pending = []  # (index, view, cache_key) for cache misses
+        
+        for index, view in enumerate(views):
+            cache_key = self._context_cache_key(view)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                contexts[index] = cached
+            else:
+                pending.append((index, view, cache_key))
+        
+        scans = [self._scan_keywords(view) for _, view, _ in pending]
+        entities = [None] * len(pending)
+        if self.nlp and pending:
+            # Texts seen before come from the entity cache; the rest go
+            # through spaCy together (automated mail skips it, as in _build_context)
+            texts = {}
+            entity_keys = {}
+            to_parse = []
+            for position, (_, view, _) in enumerate(pending):
+                if self._automated_category(scans[position][3]) in self.NO_ENTITY_CATEGORIES:
+                    continue
+                texts[position] = self._entity_text(view)
+                entity_keys[position] = self._entity_cache.make_key(texts[position])
+                entities[position] = self._entity_cache.get(entity_keys[position])
+                if entities[position] is None:
+                    to_parse.append(position)
+            
+            if to_parse:
+                try:
+                    docs = self.nlp.pipe([texts[position] for position in to_parse], batch_size=64)
+                    for position, doc in zip(to_parse, docs):
+                        entities[position] = self._entities_from_doc(doc)
+                        self._entity_cache.put(entity_keys[position], entities[position])
+                except Exception as e:
+                    logger.warning("spaCy batch extraction failed: %s", e)
+        
+        for (index, view, cache_key), email_entities, scan in zip(pending, entities, scans):
+            contexts[index] = self._build_context(view, cache_key, email_entities, scan)
+        
+        return contexts
+    
+    def _context_cache_key(self, view: _EmailView) -> Optional[bytes]:
+        """Cache key covering every email field that affects the extracted context"""
+        return self._cache.make_key(
+            view.subject,
+            view.body,
+            view.sender_name,
+            view.has_attachments,
+            view.attachment_count,
+            view.priority_level
+        )
+    
+    def _entity_text(self, view: _EmailView) -> str:
+        """Text passed to spaCy for entity extraction (length-limited for performance)"""
+        subject = view.subject
+        body = view.body
+        limit = self.NER_MAX_CHARS
+        if len(subject) + 1 + len(body) <= limit:
+            return f"{subject} {body}"
+        
+        # f"{subject} {body}"[:limit] without copying the whole body first
+        if len(subject) >= limit:
+            text = subject[:limit]
+        else:
+            text = f"{subject} {body[:limit - 1 - len(subject)]}"
+        
+        # End at the last sentence inside the limit, so the cut doesn't split
+        # an entity - unless that would drop more than half the text
+        cut = text.rfind('. ')
+        return text[:cut + 1] if cut > limit // 2 else text
+    
+    def _scan_keywords(self, view: _EmailView) -> Tuple[str, str, str, Callable[[str], bool]]:
+        """
+        Lowercased subject, body and f"{subject} {body}" of an email, and the
+        keyword-group test over the joined text
+        """
+        # Lowercase once for every pattern and keyword check
+        subject_lower = view.subject.lower()
+        body_lower = view.body.lower()
+        # Lowering each part and joining with a space equals lowering the joined text
+        full_lower = f"{subject_lower} {body_lower}"
+        return subject_lower, body_lower, full_lower, self._keyword_matcher(full_lower)
+    
+    def _build_context(self, view: _EmailView, cache_key: Optional[bytes],
+                       entities: Optional[Dict[str, List[str]]] = None,
+                       scan: Optional[Tuple[str, str, str, Callable[[str], bool]]] = None) -> Dict[str, Any]:
+        """
+        Build the context dict for one email
+        
+        Args:
+            view: Email fields
+            cache_key: Key to store the result under (None to skip caching)
+            entities: Entity fields from a batch run (extracted here if None)
+            scan: _scan_keywords() result from a batch run (computed here if None)
+        """
+        
+        started = time.perf_counter()
+        batch_entities = entities is not None
+        
+        subject = view.subject
+        body = view.body
+        sender_name = view.sender_name
+        
+        context = EmailContext(
+            sender_name=sender_name,
+            subject=subject,
+            has_attachments=view.has_attachments,
+            attachment_count=view.attachment_count
+        )
         
         try:
+            # Urgency and category share one keyword scan
+            subject_lower, body_lower, full_lower, has_keywords = scan or self._scan_keywords(view)
+            
+            # Automated mail is categorized from keywords alone, before spaCy
+            automated_category = self._automated_category(has_keywords)
+            
             # Extract entities using spaCy
-            if self.nlp:
-                context = self._extract_entities_spacy(full_text, context)
+            if (entities is None and self.nlp
+                    and automated_category not in self.NO_ENTITY_CATEGORIES):
+                entities = self._extract_entities_spacy(self._entity_text(view))
+            if entities:
+                for key, values in entities.items():
+                    setattr(context, key, values)
             
             # Extract questions
-            context['questions'] = self._extract_questions(body)
+            context.questions = self._extract_questions(body)
             
             # Extract action items
-            context['action_items'] = self._extract_action_items(body)
+            context.action_items = self._extract_action_items(body, body_lower)
             
             # Extract deadlines
-            context['deadlines'] = self._extract_deadlines(full_text)
+            context.deadlines = self._extract_deadlines_lowered(full_lower)
             
             # Determine main topic
-            context['main_topic'] = self._determine_main_topic(subject, body, context)
+            context.main_topic = self._determine_main_topic(subject, body, context)
             
             # Determine urgency
-            context['urgency_level'] = self._determine_urgency(email_data, context)
+            context.urgency_level = self._determine_urgency(view, context, has_keywords)
             
             # Categorize email
-            context['email_category'] = self._categorize_email(subject, body, context)
+            context.email_category = automated_category or self._categorize_email(has_keywords, context)
             
             # Extract key phrases
-            context['key_phrases'] = self._extract_key_phrases(body)
+            context.key_phrases = self._extract_key_phrases(body)
             
-            context['extracted_successfully'] = True
-            print(f"[OK] Context extracted: Topic='{context['main_topic']}', Category={context['email_category']}")
+            context.extracted_successfully = True
+            logger.debug("Context extracted: Topic='%s', Category=%s", context.main_topic, context.email_category)
             
         except Exception as e:
-            print(f"[WARNING] Context extraction error: {e}")
-            context['extracted_successfully'] = False
-        
-        return context
+            logger.warning("Context extraction error: %s", e)
+            context.extracted_successfully = False
+        
+        result = context.to_dict()
+        if context.extracted_successfully:
+            # spaCy time from a batch run isn't measured here - always keep those
+            compute_seconds = None if batch_entities else time.perf_counter() - started
+            self._cache.put(cache_key, result, compute_seconds)
+        return result
     
-    def _extract_entities_spacy(self, text: str, context: Dict) -> Dict:
-        """Extract named entities using spaCy"""
+    def _extract_entities_spacy(self, text: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Extract named entities using spaCy (None if it fails)
+        
+        Args:
+            text: Length-limited text from _entity_text
+        """
+        cache_key = self._entity_cache.make_key(text)
+        entities = self._entity_cache.get(cache_key)
+        if entities is not None:
+            return entities
+        
         try:
-            # Limit text length for performance
-            doc = self.nlp(text[:5000])
-            
-            for ent in doc.ents:
-                if ent.label_ == 'PERSON':
-                    if ent.text not in context['entities']['people']:
-                        context['entities']['people'].append(ent.text)
-                        
-                elif ent.label_ == 'ORG':
-                    if ent.text not in context['entities']['organizations']:
-                        context['entities']['organizations'].append(ent.text)
-                        
-                elif ent.label_ == 'DATE':
-                    if ent.text not in context['entities']['dates']:
-                        context['entities']['dates'].append(ent.text)
-                        
-                elif ent.label_ in ['GPE', 'LOC']:
-                    if ent.text not in context['entities']['locations']:
-                        context['entities']['locations'].append(ent.text)
-                        
-                elif ent.label_ == 'MONEY':
-                    if ent.text not in context['entities']['money']:
-                        context['entities']['money'].append(ent.text)
-            
-            # Limit number of entities
-            for key in context['entities']:
-                context['entities'][key] = context['entities'][key][:5]
-                
+            entities = self._entities_from_doc(self.nlp(text))
         except Exception as e:
-            print(f"[WARNING] spaCy extraction failed: {e}")
+            logger.warning("spaCy extraction failed: %s", e)
+            return None
         
-        return context
+        self._entity_cache.put(cache_key, entities)
+        return entities
+    
+    def _fill_skipped_entities(self, view: _EmailView, context: Dict[str, Any]):
+        """
+        Add the entities _build_context skipped for automated mail, once
+        the email turns out to need a reply after all
+        
+        Args:
+            view: Email fields
+            context: The email's context dict (updated in place)
+        """
+        if self.nlp and context.get('email_category') in self.NO_ENTITY_CATEGORIES:
+            entities = self._extract_entities_spacy(self._entity_text(view))
+            if entities:
+                context['entities'] = entities
+    
+    def _entities_from_doc(self, doc: Any) -> Dict[str, List[str]]:
+        """Entity fields (see EmailContext.ENTITY_FIELDS) from a parsed spaCy Doc"""
+        entities = {key: [] for key in EmailContext.ENTITY_FIELDS}
+        
+        # Keep the first 5 distinct entities per field; a full field
+        # skips further checks, and the membership test stays on <= 5 items
+        label_fields = self._entity_label_fields
+        for ent in doc.ents:
+            field_name = label_fields.get(ent.label)
+            if field_name is not None:
+                values = entities[field_name]
+                if len(values) < 5:
+                    text = ent.text
+                    if text not in values:
+                        values.append(text)
+        
+        return entities
     
     def _extract_questions(self, text: str) -> List[str]:
         """Extract questions from email that are actually directed at the user"""
         questions = []
         
-        # Find sentences ending with ?
-        question_sentences = [s.strip() for s in text.split('.') if '?' in s]
-        
-        for sentence in question_sentences:
+        # Find sentences containing ? (lazily - the loop stops after 3 questions)
+        for sentence in _question_segments(text):
             # Clean up
             sentence = sentence.strip()
             if len(sentence) < 10:  # Too short
@@ -696,58 +1810,42 @@ class EmailContextExtractor:
         """Check if question is asking the USER something (not rhetorical or general)"""
         question_lower = question.lower()
         
-        # Questions directed at user typically contain these patterns
-        user_directed_patterns = [
-            r'\b(can you|could you|would you|will you|do you|did you|have you|are you)\b',
-            r'\b(your|you\'re|you\'ll|you\'ve)\b',
-            r'\b(what (do|did|will) you|when (do|did|will) you|where (do|did|will) you|how (do|did|will) you|why (do|did|will) you)\b',
-            r'\b(please (let|tell|send|provide|confirm|advise))\b',
-            r'\b(need (you to|your))\b'
-        ]
-        
         # Check if question matches user-directed patterns
-        for pattern in user_directed_patterns:
-            if re.search(pattern, question_lower):
-                return True
-        
-        # Questions starting with these words are often directed at recipient
-        directed_starts = ['can you', 'could you', 'would you', 'will you', 'do you', 'did you', 
-                          'have you', 'are you', 'what would you', 'when can you', 'how can you']
-        
-        if any(question_lower.startswith(start) for start in directed_starts):
+        if self.user_directed_re.search(question_lower):
             return True
         
-        return False
+        # Questions starting with these words are often directed at recipient
+        return question_lower.startswith(self.DIRECTED_QUESTION_STARTS)
     
     def _is_rhetorical_question(self, question: str) -> bool:
         """Identify rhetorical questions that don't need answers"""
         question_lower = question.lower()
         
         # Common rhetorical question patterns
-        rhetorical_patterns = [
-            r'\b(isn\'t (it|that) (great|amazing|wonderful|exciting))\b',
-            r'\b(who doesn\'t (love|want|like))\b',
-            r'\b(what could be (better|more))\b',
-            r'\b(right\?|correct\?)$'  # Questions ending with "right?" or "correct?"
-        ]
-        
-        for pattern in rhetorical_patterns:
-            if re.search(pattern, question_lower):
-                return True
-        
-        return False
+        return self.rhetorical_re.search(question_lower) is not None
     
-    def _extract_action_items(self, text: str) -> List[str]:
+    def _extract_action_items(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """Extract action items/requests that are actually directed at the user"""
         action_items = []
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        text_lower = _casefold_lowered(text_lower)
         
+        text_length = len(text)
         for pattern in self.action_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
+            # Walk the matches with search(pos) - no pattern matches the
+            # empty string, so this visits the same matches as finditer
+            search = pattern.search
+            position = 0
+            while len(action_items) < 3:  # Limit to 3 validated action items
+                match = search(text_lower, position)
+                if match is None:
+                    break
+                position = match.end()
+                
                 # Get the sentence containing the match
                 start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 100)
+                end = min(text_length, position + 100)
                 snippet = text[start:end].strip()
                 
                 if not snippet or len(snippet) < 15:
@@ -761,10 +1859,7 @@ class EmailContextExtractor:
                 if self._is_past_tense_action(snippet):
                     continue
                 
-                action_items.append(snippet[:150])  # Limit length
-                    
-                if len(action_items) >= 3:  # Limit to 3 validated action items
-                    break
+                action_items.append(snippet[:150])  # Limit length
             
             if len(action_items) >= 3:
                 break
@@ -776,30 +1871,16 @@ class EmailContextExtractor:
         text_lower = text.lower()
         
         # Patterns indicating request to user
-        request_patterns = [
-            r'\b(please|kindly|could you|can you|would you) (upload|send|provide|submit|complete|review|confirm|fill|click)\b',
-            r'\b(you (need|must|should|have) to|you\'ll need to)\b',
-            r'\b(to (get|proceed|continue|register|attend), (please|kindly|you need to|you must))\b',
-            r'\b(action (required|needed)|require (your|you to))\b'
-        ]
-        
-        for pattern in request_patterns:
-            if re.search(pattern, text_lower):
-                return True
+        if self.user_request_re.search(text_lower):
+            return True
         
         # Check for imperative mood (commands directed at user)
         if self._is_imperative_mood(text):
             return True
         
         # Filter out "I will" statements (sender's actions, not user's)
-        sender_action_patterns = [
-            r'\b(i will|i\'ll|we will|we\'ll|i am|i\'m|we are|we\'re)\b',
-            r'\b(has been|have been|was|were) (sent|completed|updated|processed)\b'
-        ]
-        
-        for pattern in sender_action_patterns:
-            if re.search(pattern, text_lower):
-                return False
+        if self.sender_action_re.search(text_lower):
+            return False
         
         return True
     
@@ -807,16 +1888,9 @@ class EmailContextExtractor:
         """Check if sentence is in imperative mood (command/request)"""
         sentence_lower = sentence.lower().strip()
         
-        # Imperative sentences often start with verbs
-        imperative_starts = [
-            'upload', 'send', 'provide', 'submit', 'complete', 'review', 'confirm',
-            'fill', 'click', 'download', 'register', 'attend', 'join', 'visit',
-            'check', 'update', 'install', 'contact', 'call', 'email', 'reply'
-        ]
-        
-        # Check if sentence starts with imperative verb
-        first_word = sentence_lower.split()[0] if sentence_lower else ''
-        if any(first_word.startswith(verb) for verb in imperative_starts):
+        # Check if sentence starts with imperative verb (only the first word is split off)
+        first_word = sentence_lower.split(None, 1)[0] if sentence_lower else ''
+        if first_word.startswith(self.IMPERATIVE_STARTS):
             return True
         
         # Check for "Please [verb]" pattern
@@ -830,27 +1904,22 @@ class EmailContextExtractor:
         text_lower = text.lower()
         
         # Past tense indicators
-        past_patterns = [
-            r'\b(has been|have been|was|were) (sent|completed|updated|processed|uploaded|submitted)\b',
-            r'\b(sent|completed|updated|processed|uploaded|submitted|registered|confirmed) (on|at|yesterday|last)\b',
-            r'\b(already|previously) (sent|completed|updated|processed)\b'
-        ]
-        
-        for pattern in past_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        return self.past_action_re.search(text_lower) is not None
     
     def _extract_deadlines(self, text: str) -> List[str]:
         """Extract deadline mentions"""
+        return self._extract_deadlines_lowered(text.lower())
+    
+    def _extract_deadlines_lowered(self, text_lower: str) -> List[str]:
+        """_extract_deadlines() for already lowercased text"""
         deadlines = []
-        text_lower = text.lower()
+        scan_text = _casefold_lowered(text_lower)
         
         for pattern in self.deadline_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
+            matches = pattern.finditer(scan_text)
             for match in matches:
-                deadline_text = match.group(0).strip()
+                # Report the lowered text itself, not its casefolded copy
+                deadline_text = text_lower[match.start():match.end()].strip()
                 if deadline_text and deadline_text not in deadlines:
                     deadlines.append(deadline_text)
                     
@@ -859,155 +1928,245 @@ class EmailContextExtractor:
         
         return deadlines
     
-    def _determine_main_topic(self, subject: str, body: str, context: Dict) -> str:
+    def _determine_main_topic(self, subject: str, body: str, context: EmailContext) -> str:
         """Determine the main topic/subject of the email"""
         
         # Start with subject if meaningful
         if subject and len(subject) > 5:
-            # Remove common prefixes
-            topic = re.sub(r'^(re:|fwd:|fw:)\s*', '', subject, flags=re.IGNORECASE).strip()
+            # Remove common prefixes (repeatedly, e.g. "Re: Fwd: ...")
+            topic = subject.strip()
+            topic_lower = topic.lower()
+            while True:
+                for prefix in self.SUBJECT_PREFIXES:
+                    if topic_lower.startswith(prefix):
+                        topic = topic[len(prefix):].lstrip()
+                        topic_lower = topic.lower()
+                        break
+                else:
+                    break
             
             # If subject is meaningful, use it
             if len(topic) > 10:
                 return topic[:100]  # Limit length
         
-        # Try to extract from first sentence of body
-        sentences = body.split('.')
-        if sentences:
-            first_sentence = sentences[0].strip()
-            if 20 < len(first_sentence) < 150:
-                return first_sentence
+        # Try to extract from first sentence of body (without splitting the rest)
+        first_sentence = body.partition('.')[0].strip()
+        if 20 < len(first_sentence) < 150:
+            return first_sentence
         
         # Fallback to "your email"
         return "your email"
     
-    def _determine_urgency(self, email_data: Dict, context: Dict) -> str:
-        """Determine urgency level"""
+    def _determine_urgency(self, view: _EmailView, context: EmailContext,
+                           has_keywords: Callable[[str], bool]) -> str:
+        """Determine urgency level (has_keywords from _keyword_matcher)"""
         
         # Check priority level from email data
-        priority_level = email_data.get('priority_level', 'Medium')
-        if priority_level == 'High':
+        if view.priority_level == 'High':
             return 'high'
         
         # Check for urgent keywords
-        text = f"{email_data.get('subject', '')} {email_data.get('body', '')}".lower()
-        urgent_keywords = ['urgent', 'asap', 'emergency', 'critical', 'immediately', 'right away']
-        
-        if any(keyword in text for keyword in urgent_keywords):
+        if has_keywords('urgent'):
             return 'urgent'
         
         # Check for deadlines
-        if context.get('deadlines'):
+        if context.deadlines:
             return 'high'
         
         return 'normal'
     
-    def _categorize_email(self, subject: str, body: str, context: Dict) -> str:
-        """Categorize the type of email with enhanced granularity"""
-        
-        text = f"{subject} {body}".lower()
+    def _automated_category(self, has_keywords: Callable[[str], bool]) -> Optional[str]:
+        """Category of automated mail (alerts, receipts, newsletters, ...) if any, from keywords alone"""
         
         # NEW: Security alerts (high priority, action required)
-        if any(word in text for word in ['security alert', 'suspicious activity', 'detected', 'exposed', 'breach', 'unauthorized']):
+        if has_keywords('security_alert'):
             return 'security_alert'
         
         # NEW: Transactional (receipts, confirmations - no reply needed)
-        if any(word in text for word in ['receipt', 'invoice', 'order confirmation', 'payment received', 'transaction complete']):
+        if has_keywords('transactional'):
             return 'transactional'
         
         # NEW: Newsletter/digest (periodic updates - no reply needed)
-        if any(word in text for word in ['newsletter', 'digest', 'weekly update', 'monthly update', 'subscriber', 'unsubscribe']):
+        if has_keywords('newsletter'):
             return 'newsletter'
         
         # NEW: Marketing (promotional content - no reply needed)
-        if any(word in text for word in ['exclusive offer', 'limited time', 'special deal', 'shop now', 'buy now', 'discover', 'new features']):
+        if has_keywords('marketing'):
             return 'marketing'
         
         # NEW: Announcement (events, news - no reply needed typically)
-        if any(word in text for word in ['save the date', 'join us', 'we\'re excited to announce', 'upcoming event', 'event details']):
+        if has_keywords('announcement'):
             return 'announcement'
         
         # NEW: Invitation (events - RSVP optional)
-        if any(word in text for word in ['you\'re invited', 'invitation to', 'rsvp', 'please join us', 'can you attend']):
+        if has_keywords('invitation'):
             return 'invitation'
         
         # NEW: Notification (automated alerts - no reply needed)
-        if any(word in text for word in ['your account', 'has been updated', 'confirmation of', 'status update', 'activity notification']):
+        if has_keywords('notification'):
             # Check if it's a specific notification that needs action
-            if 'action required' in text or 'please' in text:
+            if has_keywords('notification_action_required'):
                 return 'notification_action_required'
             return 'notification'
         
+        return None
+    
+    def _categorize_email(self, has_keywords: Callable[[str], bool], context: EmailContext) -> str:
+        """Categorize an email that isn't automated mail (see _automated_category) with enhanced granularity"""
+        
         # EXISTING: Meeting/scheduling
-        if any(word in text for word in ['meeting', 'call', 'schedule', 'appointment', 'available']):
+        if has_keywords('meeting_request'):
             return 'meeting_request'
         
         # EXISTING: Questions (validated questions in context)
-        if context.get('questions'):  # Now uses validated questions only
+        if context.questions:  # Now uses validated questions only
             return 'question'
         
         # EXISTING: Problem/issue
-        if any(word in text for word in ['problem', 'issue', 'error', 'broken', 'bug', 'help', 'support']):
+        if has_keywords('problem_report'):
             return 'problem_report'
         
         # EXISTING: Request for information
-        if any(word in text for word in ['send', 'provide', 'share', 'need', 'request', 'looking for']):
+        if has_keywords('info_request'):
             return 'info_request'
         
         # EXISTING: Follow-up
-        if any(word in text for word in ['follow up', 'following up', 'checking in', 'status', 'update']):
+        if has_keywords('follow_up'):
             return 'follow_up'
         
         # EXISTING: Thank you
-        if any(word in text for word in ['thank', 'thanks', 'appreciate', 'grateful']):
+        if has_keywords('acknowledgment'):
             return 'acknowledgment'
         
         return 'general'
     
+    def _keyword_matcher(self, full_lower: str) -> Callable[[str], bool]:
+        """
+        Return a test for whether a keyword group (CATEGORY_KEYWORDS or
+        'urgent') appears in the lowered f"{subject} {body}" - keywords such
+        as 'save the date' can span the join
+        
+        With pyahocorasick the text is scanned once up front; otherwise each
+        group is searched with bytes.find when it's first asked about.
+        """
+        if self._keyword_automaton is not None:
+            found = 0
+            for _, bits in self._keyword_automaton.iter(full_lower):
+                found |= bits
+            keyword_bits = self._keyword_bits
+            return lambda group: bool(found & keyword_bits[group])
+        
+        # Keywords are ASCII bytes, so search the UTF-8 bytes of the text
+        text = full_lower.encode('utf-8')
+        keyword_groups = self._keyword_groups
+        return lambda group: self._contains_any(keyword_groups[group], text)
+    
+    def _contains_any(self, keywords: Tuple[bytes, ...], text: bytes) -> bool:
+        """Check if any keyword appears in the (lowercased, UTF-8) text"""
+        return any(text.find(keyword) >= 0 for keyword in keywords)
+    
     def _extract_key_phrases(self, text: str) -> List[str]:
         """Extract key phrases that should be acknowledged"""
         
-        key_phrases = []
-        
-        # Look for quoted text
-        quoted = re.findall(r'"([^"]+)"', text)
-        key_phrases.extend(quoted[:2])
-        
-        # Look for emphasized phrases (ALL CAPS)
-        caps_phrases = re.findall(r'\b[A-Z]{4,}\b', text)
-        key_phrases.extend(caps_phrases[:2])
+        # Quoted text and emphasized phrases (ALL CAPS) are found in one pass
+        quoted = []
+        caps_phrases = []
+        for match in _KEY_PHRASE_RE.finditer(text):
+            if match.lastgroup == 'quoted':
+                if len(quoted) < 2:
+                    quoted.append(match.group('quoted'))
+            elif len(caps_phrases) < 2:
+                caps_phrases.append(match.group('caps'))
+            
+            # Two quotes plus one caps phrase already fill the 3 slots
+            if len(quoted) == 2 and caps_phrases:
+                break
         
-        return key_phrases[:3]  # Limit to 3 phrases
+        return (quoted + caps_phrases)[:3]  # Limit to 3 phrases
 
 
 # =============================================================================
-# BART-BASED ACKNOWLEDGMENT GENERATOR
+# ACKNOWLEDGMENT GENERATOR
 # =============================================================================
 
 class BARTAcknowledgmentGenerator:
     """
-    Uses BART model creatively to generate contextual acknowledgments
+    Generates contextual acknowledgments from natural phrase variations
     """
     
+    # Phrase options for natural acknowledgments (see _acknowledgment_choices)
+    _RELATIONSHIP_GREETINGS = {
+        'friend': ("Hey", "Hi", "Hey there"),
+        'colleague': ("Hi", "Hey", "Hi there")
+    }
+    _FORMAL_GREETINGS = ("Hi", "Hello")
+    _DEFAULT_GREETINGS = ("Hi", "Hey", "Hi there")
+    
+    _OPENINGS = (
+        "Got it",
+        "Thanks for sending this over",
+        "Thanks",
+        "Perfect timing",
+        "Appreciate this",
+        "Got your email",
+        "Thanks for reaching out"
+    )
+    
+    _QUESTION_ACTIONS = (
+        "I'll get back to you on those questions",
+        "Let me look into those questions for you",
+        "I'll check on that and get back to you",
+        "I'll find out and let you know"
+    )
+    _ATTACHMENT_ACTIONS = (
+        "I'll take a look at the doc",
+        "Let me review what you sent",
+        "I'll check out the attachment",
+        "I'll go through the file"
+    )
+    _URGENT_ACTIONS = (
+        "I'll get on this right away",
+        "I'll prioritize this",
+        "I'll handle this ASAP",
+        "I'll take care of this quickly"
+    )
+    _DEFAULT_ACTIONS = (
+        "I'll take a look",
+        "Let me check on that",
+        "I'll review this",
+        "I'll get on this",
+        "Let me look into this"
+    )
+    
+    _DEADLINE_TIMELINES = ("before {}", "by {}", "in time for {}")
+    _URGENT_TIMELINES = ("soon", "asap", "quickly")
+    _DEFAULT_TIMELINES = ("soon", "shortly", "in a bit")
+    
+    _RELATIONSHIP_CLOSINGS = {
+        'friend': ("Thanks!", "Talk soon!", "Cheers!", "Thanks!"),
+        'colleague': ("Thanks!", "Best", "Talk soon", "Thanks")
+    }
+    _DEFAULT_CLOSINGS = ("Thanks", "Best", "Thanks!", "Best regards")
+    
+    # Fixed messages for no-reply intents (intents not listed get None)
+    _NO_REPLY_MESSAGES = {
+        'invitation': "Thanks for the invitation! I'll let you know if I can attend."
+    }
+    
     def __init__(self):
-        """Initialize BART generator"""
-        print("[INFO] Initializing BART Acknowledgment Generator...")
+        """Initialize acknowledgment generator"""
+        logger.info("Initializing Acknowledgment Generator...")
         
-        try:
-            # Load BART summarization model
-            self.bart = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",
-                device=-1  # CPU
-            )
-            print("[OK] BART model loaded successfully")
-        except Exception as e:
-            print("[ERROR] Failed to load BART: {e}")
-            self.bart = None
+        # Own PRNG for phrase picks - no contention on the module-level one,
+        # and tests can seed it directly
+        self._rng = random.Random()
+        
+        # Vectorized phrase sampling for batch acknowledgments
+        self._np_rng = np.random.default_rng()
     
     def generate_acknowledgment(self, context: Dict[str, Any], tone: str = 'business') -> str:
         """
-        Generate contextual acknowledgment using BART
+        Generate contextual acknowledgment
         
         Args:
             context: Extracted email context
@@ -1016,219 +2175,120 @@ class BARTAcknowledgmentGenerator:
         Returns:
             Generated acknowledgment text
         """
+        return self.generate_acknowledgments_batch([context], tone)[0]
+    
+    def generate_acknowledgments_batch(self, contexts: List[Dict[str, Any]],
+                                       tone: str = 'business') -> List[str]:
+        """
+        Generate acknowledgments for several emails at once
         
-        if not self.bart:
-            return self._fallback_acknowledgment(context, tone)
+        Args:
+            contexts: Extracted email contexts
+            tone: Desired tone (formal, business, casual)
+            
+        Returns:
+            Generated acknowledgment text for each context, in order
+        """
         
         try:
-            # Build intelligent prompt for BART
-            prompt = self._build_bart_prompt(context)
-            
-            # Generate with BART
-            result = self.bart(
-                prompt,
-                max_length=100,
-                min_length=30,
-                do_sample=False
-            )
-            
-            acknowledgment = result[0]['summary_text']
-            
-            # Post-process to make it sound natural
-            acknowledgment = self._post_process_acknowledgment(result[0]['summary_text'], context, tone)
+            # The reply is always the natural acknowledgment - a BART summary
+            # was never part of it, so the model isn't run (or loaded) here
+            if len(contexts) == 1:
+                acknowledgments = [self._build_natural_acknowledgment(contexts[0], tone)]
+            else:
+                acknowledgments = self._build_natural_acknowledgments_batch(contexts, tone)
             
-            print(f"[OK] BART generated: '{acknowledgment[:60]}...'")
-            return acknowledgment
+            if logger.isEnabledFor(logging.INFO):
+                for acknowledgment in acknowledgments:
+                    logger.info("Acknowledgment generated: '%.60s...'", acknowledgment)
+            return acknowledgments
             
         except Exception as e:
-            print(f"[WARNING] BART generation failed: {e}, using fallback")
-            return self._fallback_acknowledgment(context, tone)
+            logger.warning("Acknowledgment generation failed: %s, using fallback", e)
+            return [self._fallback_acknowledgment(context, tone) for context in contexts]
     
-    def _build_bart_prompt(self, context: Dict[str, Any]) -> str:
-        """Build an intelligent prompt for BART"""
-        
-        # Create a pseudo-email that BART can "summarize" into an acknowledgment
-        prompt_parts = []
-        
-        # Add topic
-        topic = context.get('main_topic', '')
-        if topic:
-            prompt_parts.append(f"Email about: {topic}.")
-        
-        # Add questions
-        questions = context.get('questions', [])
-        if questions:
-            prompt_parts.append(f"Questions asked: {' '.join(questions[:2])}")
-        
-        # Add action items
-        action_items = context.get('action_items', [])
-        if action_items:
-            prompt_parts.append(f"Requested: {action_items[0]}")
-        
-        # Add entities
-        entities = context.get('entities', {})
-        if entities.get('dates'):
-            prompt_parts.append(f"Timeline mentioned: {entities['dates'][0]}")
-        
-        # Add attachment info
-        if context.get('has_attachments'):
-            count = context.get('attachment_count', 1)
-            prompt_parts.append(f"{count} attachment(s) included.")
-        
-        # Add urgency
-        if context.get('urgency_level') in ['urgent', 'high']:
-            prompt_parts.append("Marked as urgent.")
-        
-        prompt = " ".join(prompt_parts)
+    def _build_natural_acknowledgment(self, context: Dict, tone: str) -> str:
+        """Build human-sounding acknowledgment with natural language"""
         
-        # Ensure minimum length for BART
-        if len(prompt) < 50:
-            prompt += " Need to acknowledge receipt and provide response timeline."
+        greetings, openings, actions, timeline_phrases, closings = \
+            self._acknowledgment_choices(context, tone)
         
-        return prompt
+        return self._format_acknowledgment(
+            context,
+            self._rng.choice(greetings),
+            self._rng.choice(openings),
+            self._rng.choice(actions),
+            self._rng.choice(timeline_phrases),
+            self._rng.choice(closings)
+        )
     
-    def _post_process_acknowledgment(self, text: str, context: Dict, tone: str) -> str:
-        """Post-process BART output to make it natural"""
-        
-        # Remove common BART artifacts
-        text = text.replace("Email about:", "regarding")
-        text = text.replace("Questions asked:", "your questions about")
-        text = text.replace("Requested:", "your request for")
-        text = text.replace("Timeline mentioned:", "for")
-        text = text.replace("attachment(s) included.", "attachments.")
-        text = text.replace("Marked as urgent.", "")
-        
-        # Remove duplicate information
-        text = re.sub(r'\d+\s+attachment\(s\)\s+included\.', '', text)
+    def _build_natural_acknowledgments_batch(self, contexts: List[Dict], tone: str) -> List[str]:
+        """
+        Build natural acknowledgments for many emails at once
         
-        # Clean up spacing
-        text = re.sub(r'\s+', ' ', text).strip()
+        All random picks (5 per email) are drawn with a single numpy call
+        instead of one random.choice per phrase.
+        """
+        if not contexts:
+            return []
         
-        # Build a natural acknowledgment instead of using raw BART output
-        acknowledgment = self._build_natural_acknowledgment(context, tone)
+        choices = [self._acknowledgment_choices(context, tone) for context in contexts]
+        lengths = np.array([[len(options) for options in slots] for slots in choices])
+        picks = self._np_rng.integers(0, lengths).tolist()
         
-        return acknowledgment
+        return [
+            self._format_acknowledgment(
+                context, *(options[index] for options, index in zip(slots, row))
+            )
+            for context, slots, row in zip(contexts, choices, picks)
+        ]
     
-    def _build_natural_acknowledgment(self, context: Dict, tone: str) -> str:
-        """Build human-sounding acknowledgment with natural language"""
-        import random
+    def _acknowledgment_choices(self, context: Dict, tone: str) -> Tuple[Tuple[str, ...], ...]:
+        """Phrase options for an acknowledgment: greetings, openings, actions, timelines, closings"""
         
-        sender_name = context.get('sender_name', 'there')
-        subject = context.get('subject', '')
         urgency = context.get('urgency_level', 'normal')
-        has_attachments = context.get('has_attachments', False)
-        questions = context.get('questions', [])
         deadlines = context.get('deadlines', [])
         
         # Determine relationship for greeting style
         relationship = context.get('relationship_context', 'professional')
         
         # Natural greeting variations
-        if relationship == 'friend':
-            greetings = ["Hey", "Hi", "Hey there"]
-        elif relationship == 'colleague':
-            greetings = ["Hi", "Hey", "Hi there"]
-        elif tone == 'formal':
-            greetings = ["Hi", "Hello"]
-        else:
-            greetings = ["Hi", "Hey", "Hi there"]
-        
-        greeting = f"{random.choice(greetings)} {sender_name},"
-        
-        # Natural opening variations
-        openings = [
-            "Got it",
-            "Thanks for sending this over", 
-            "Thanks",
-            "Perfect timing",
-            "Appreciate this",
-            "Got your email",
-            "Thanks for reaching out"
-        ]
+        greetings = self._RELATIONSHIP_GREETINGS.get(relationship)
+        if greetings is None:
+            greetings = self._FORMAL_GREETINGS if tone == 'formal' else self._DEFAULT_GREETINGS
         
         # Natural action phrases based on content
-        if questions:
-            actions = [
-                "I'll get back to you on those questions",
-                "Let me look into those questions for you",
-                "I'll check on that and get back to you",
-                "I'll find out and let you know"
-            ]
-        elif has_attachments:
-            actions = [
-                "I'll take a look at the doc",
-                "Let me review what you sent",
-                "I'll check out the attachment",
-                "I'll go through the file"
-            ]
-        elif urgency in ['urgent', 'high']:
-            actions = [
-                "I'll get on this right away",
-                "I'll prioritize this",
-                "I'll handle this ASAP",
-                "I'll take care of this quickly"
-            ]
+        if context.get('questions', []):
+            actions = self._QUESTION_ACTIONS
+        elif context.get('has_attachments', False):
+            actions = self._ATTACHMENT_ACTIONS
+        elif urgency in ('urgent', 'high'):
+            actions = self._URGENT_ACTIONS
         else:
-            actions = [
-                "I'll take a look",
-                "Let me check on that",
-                "I'll review this",
-                "I'll get on this",
-                "Let me look into this"
-            ]
+            actions = self._DEFAULT_ACTIONS
         
         # Add timeline context naturally
-        timeline_phrases = []
         if deadlines:
             deadline = deadlines[0]
-            timeline_phrases = [
-                f"before {deadline}",
-                f"by {deadline}",
-                f"in time for {deadline}"
-            ]
-        elif urgency in ['urgent', 'high']:
-            timeline_phrases = [
-                "soon",
-                "asap",
-                "quickly"
-            ]
+            timeline_phrases = tuple(template.format(deadline) for template in self._DEADLINE_TIMELINES)
+        elif urgency in ('urgent', 'high'):
+            timeline_phrases = self._URGENT_TIMELINES
         else:
-            timeline_phrases = [
-                "soon",
-                "shortly",
-                "in a bit"
-            ]
+            timeline_phrases = self._DEFAULT_TIMELINES
         
         # Natural closings
-        if relationship == 'friend':
-            closings = ["Thanks!", "Talk soon!", "Cheers!", "Thanks!"]
-        elif relationship == 'colleague':
-            closings = ["Thanks!", "Best", "Talk soon", "Thanks"]
-        else:
-            closings = ["Thanks", "Best", "Thanks!", "Best regards"]
-        
-        # Build the reply
-        parts = [greeting]
+        closings = self._RELATIONSHIP_CLOSINGS.get(relationship, self._DEFAULT_CLOSINGS)
         
-        # Add opening
-        opening = random.choice(openings)
-        parts.append(opening + ".")
-        
-        # Add action with timeline
-        action = random.choice(actions)
-        timeline = random.choice(timeline_phrases)
-        
-        # Combine action and timeline naturally
-        if timeline in ["soon", "asap", "quickly"]:
-            parts.append(f"{action} {timeline}.")
-        else:
-            parts.append(f"{action} {timeline}.")
+        return greetings, self._OPENINGS, actions, timeline_phrases, closings
+    
+    def _format_acknowledgment(self, context: Dict, greeting: str, opening: str,
+                               action: str, timeline: str, closing: str) -> str:
+        """Assemble the chosen phrases into the acknowledgment text"""
         
-        # Add closing
-        closing = random.choice(closings)
-        parts.append(closing)
+        sender_name = context.get('sender_name', 'there')
         
-        return "\n\n".join(parts)
+        # Greeting, opening, action with timeline, closing
+        return f"{greeting} {sender_name},\n\n{opening}.\n\n{action} {timeline}.\n\n{closing}"
     
     def generate_no_reply_message(self, email_intent: str, context: Dict) -> Optional[str]:
         """
@@ -1236,28 +2296,17 @@ class BARTAcknowledgmentGenerator:
         Returns None if no reply should be generated at all
         """
         
-        # For most no-reply cases, return None (no reply generated)
-        if email_intent in ['transactional', 'notification', 'marketing', 'newsletter']:
-            return None
-        
         # For announcements, generate brief optional acknowledgment
         if email_intent == 'announcement':
             topic = context.get('main_topic', 'the event')
             return f"Thanks for the heads up! Looking forward to {topic}."
         
-        # For invitations, suggest RSVP
-        if email_intent == 'invitation':
-            return "Thanks for the invitation! I'll let you know if I can attend."
-        
-        # For security alerts, don't reply - take action
-        if email_intent == 'security_alert':
-            return None
-        
-        # Default: None (no reply)
-        return None
+        # Invitations get an RSVP note; transactional, notification, marketing,
+        # newsletter and security alerts (take action instead) get no reply
+        return self._NO_REPLY_MESSAGES.get(email_intent)
     
     def _fallback_acknowledgment(self, context: Dict, tone: str) -> str:
-        """Generate acknowledgment without BART (fallback)"""
+        """Generate a plain acknowledgment (fallback)"""
         
         topic = context.get('main_topic', 'your email')
         category = context.get('email_category', 'general')
@@ -1287,6 +2336,41 @@ class BARTAcknowledgmentGenerator:
 # CONFIDENCE SCORER
 # =============================================================================
 
+# Specific timeline patterns (quality), matched against the lowercased reply
+_SPECIFIC_TIMELINE_PATTERNS = [
+    re.compile(r'by \w+day'),  # by Monday, by Tuesday, by today, by tomorrow
+    re.compile(r'by eod'),
+    re.compile(r'by \d+:\d+'),  # by 3:00, by 14:30
+    re.compile(r'within \d+ (hours?|days?)'),  # within 2 hours, within 3 days
+    re.compile(r'this (morning|afternoon|evening)'),
+    re.compile(r'tomorrow (morning|afternoon|evening)')
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _phrase_group_automaton(groups: Tuple[Tuple[str, ...], ...]):
+    """
+    Aho-Corasick automaton over groups of phrases (None when pyahocorasick
+    isn't installed)
+    
+    Each phrase maps to (bitmask of the groups it is in, phrase), so a scan
+    yields every distinct phrase found along with its groups.
+    """
+    if ahocorasick is None:
+        return None
+    
+    group_bits = {}
+    for index, phrases in enumerate(groups):
+        for phrase in phrases:
+            group_bits[phrase] = group_bits.get(phrase, 0) | (1 << index)
+    
+    automaton = ahocorasick.Automaton()
+    for phrase, bits in group_bits.items():
+        automaton.add_word(phrase, (bits, phrase))
+    automaton.make_automaton()
+    return automaton
+
+
 class ConfidenceScorer:
     """
     Calculates confidence score for generated replies (ENHANCED - Priority 3)
@@ -1298,6 +2382,49 @@ class ConfidenceScorer:
     - Actual addressing of questions/actions
     """
     
+    # Generic phrases that users REMOVE (penalty indicators)
+    generic_penalty_phrases = (
+        "i'll get back to you",
+        "i'll look into this",
+        "thanks for your email about",
+        "i see your question",
+        "i'll check on this",
+        "let me get back to you",
+        "i'll follow up",
+        "i'll review this"
+    )
+    
+    # Specific phrases that users ADD (quality indicators)
+    quality_indicators = (
+        "by eod",
+        "by end of day",
+        "by tomorrow",
+        "by [day] afternoon",
+        "by [day] morning",
+        "i'll send you",
+        "i'll share",
+        "great question",
+        "good question",
+        "thanks for reaching out",
+        "happy to help",
+        "!"  # Enthusiasm marker
+    )
+    
+    # Vague timeline words (penalty)
+    vague_timelines = (
+        "soon",
+        "shortly",
+        "later",
+        "eventually",
+        "in the future"
+    )
+    
+    # Words showing a specific commitment when action items were requested
+    SPECIFIC_ACTION_WORDS = ('send', 'share', 'provide', 'schedule', 'review', 'update')
+    
+    # Enthusiasm expected in a reply to a question
+    ENTHUSIASM_MARKERS = ('!', 'great question', 'good question')
+    
     def __init__(self, learning_stats: Optional[Dict] = None):
         """
         Initialize enhanced confidence scorer
@@ -1307,52 +2434,18 @@ class ConfidenceScorer:
         """
         self.learning_stats = learning_stats
         
-        # Generic phrases that users REMOVE (penalty indicators)
-        self.generic_penalty_phrases = [
-            "i'll get back to you",
-            "i'll look into this",
-            "thanks for your email about",
-            "i see your question",
-            "i'll check on this",
-            "let me get back to you",
-            "i'll follow up",
-            "i'll review this"
-        ]
-        
-        # Specific phrases that users ADD (quality indicators)
-        self.quality_indicators = [
-            "by eod",
-            "by end of day",
-            "by tomorrow",
-            "by [day] afternoon",
-            "by [day] morning",
-            "i'll send you",
-            "i'll share",
-            "great question",
-            "good question",
-            "thanks for reaching out",
-            "happy to help",
-            "!",  # Enthusiasm marker
-        ]
-        
-        # Vague timeline words (penalty)
-        self.vague_timelines = [
-            "soon",
-            "shortly",
-            "later",
-            "eventually",
-            "in the future"
-        ]
-        
-        # Specific timeline patterns (quality)
-        self.specific_timeline_patterns = [
-            r'by \w+day',  # by Monday, by Tuesday, by today, by tomorrow
-            r'by eod',
-            r'by \d+:\d+',  # by 3:00, by 14:30
-            r'within \d+ (hours?|days?)',  # within 2 hours, within 3 days
-            r'this (morning|afternoon|evening)',
-            r'tomorrow (morning|afternoon|evening)'
-        ]
+        # Specific timeline patterns (quality) - compiled once, shared
+        self.specific_timeline_patterns = _SPECIFIC_TIMELINE_PATTERNS
+        
+        # With pyahocorasick, one pass over the reply finds the phrases of
+        # every list above (see _phrase_matches)
+        self._phrase_automaton = _phrase_group_automaton((
+            self.generic_penalty_phrases,
+            self.quality_indicators,
+            self.vague_timelines,
+            self.SPECIFIC_ACTION_WORDS,
+            self.ENTHUSIASM_MARKERS
+        ))
     
     def calculate_confidence(self, context: Dict[str, Any], generated_reply: str) -> float:
         """
@@ -1367,19 +2460,29 @@ class ConfidenceScorer:
         """
         
         score = 0.5  # Base score (neutral)
+        
+        # Empty reply: only the missing-commitment and missing-enthusiasm
+        # penalties can apply, so skip the phrase and pattern scans
+        if not generated_reply:
+            if context.get('action_items'):
+                score -= 0.15
+            if context.get('questions'):
+                score -= 0.05
+            return self._calibrate_score(score)
+        
         reply_lower = generated_reply.lower()
+        generic_count, quality_count, has_vague_timeline, has_specific_action, has_enthusiasm = \
+            self._phrase_matches(reply_lower)
         
         # ========== PENALTY FACTORS (What makes replies BAD) ==========
         
         # PENALTY 1: Generic phrases users consistently remove (-0.15 max)
-        generic_count = sum(1 for phrase in self.generic_penalty_phrases if phrase in reply_lower)
         if generic_count > 0:
             penalty = min(0.15, generic_count * 0.05)
             score -= penalty
             # print(f"[CONFIDENCE] Generic phrase penalty: -{penalty:.2f} ({generic_count} phrases)")
         
         # PENALTY 2: Vague timelines (-0.10)
-        has_vague_timeline = any(vague in reply_lower for vague in self.vague_timelines)
         if has_vague_timeline:
             score -= 0.10
             # print(f"[CONFIDENCE] Vague timeline penalty: -0.10")
@@ -1387,18 +2490,12 @@ class ConfidenceScorer:
         # PENALTY 3: No specific commitment when action needed (-0.15)
         if context.get('action_items') and len(context['action_items']) > 0:
             # Action items present - should have specific commitment
-            has_specific_action = any(
-                word in reply_lower for word in ['send', 'share', 'provide', 'schedule', 'review', 'update']
-            )
             if not has_specific_action:
                 score -= 0.15
                 # print(f"[CONFIDENCE] Missing specific action penalty: -0.15")
         
         # PENALTY 4: No enthusiasm when question asked (-0.05)
         if context.get('questions') and len(context['questions']) > 0:
-            has_enthusiasm = ('!' in generated_reply or 
-                            'great question' in reply_lower or 
-                            'good question' in reply_lower)
             if not has_enthusiasm:
                 score -= 0.05
                 # print(f"[CONFIDENCE] Missing enthusiasm penalty: -0.05")
@@ -1407,15 +2504,13 @@ class ConfidenceScorer:
         
         # QUALITY 1: Specific timeline present (+0.15)
         has_specific_timeline = any(
-            re.search(pattern, reply_lower) for pattern in self.specific_timeline_patterns
+            pattern.search(reply_lower) for pattern in self.specific_timeline_patterns
         )
         if has_specific_timeline:
             score += 0.15
             # print(f"[CONFIDENCE] Specific timeline bonus: +0.15")
         
         # QUALITY 2: Quality phrases users add (+0.10 max)
-        quality_count = sum(1 for phrase in self.quality_indicators 
-                          if phrase in reply_lower or phrase in generated_reply)
         if quality_count > 0:
             bonus = min(0.10, quality_count * 0.03)
             score += bonus
@@ -1429,9 +2524,10 @@ class ConfidenceScorer:
             if topic_lower in reply_lower and len(topic_lower) > 5:
                 topic_mentioned = True
         
-        entities_mentioned = any(
-            entity.lower() in reply_lower 
-            for entities in context.get('entities', {}).values() 
+        # Only scan for entities when the topic didn't already earn the bonus
+        entities_mentioned = not topic_mentioned and any(
+            entity.lower() in reply_lower
+            for entities in context.get('entities', {}).values()
             for entity in entities
         )
         
@@ -1462,6 +2558,38 @@ class ConfidenceScorer:
             score += 0.05
             # print(f"[CONFIDENCE] Good length bonus: +0.05 ({word_count} words)")
         
+        return self._calibrate_score(score)
+    
+    def _phrase_matches(self, reply_lower: str) -> Tuple[int, int, bool, bool, bool]:
+        """
+        Number of generic penalty phrases, number of quality phrases, and
+        whether a vague timeline / specific action word / enthusiasm marker
+        appears in the reply
+        
+        With pyahocorasick the reply is scanned once for all of them;
+        otherwise each phrase is searched for separately.
+        """
+        if self._phrase_automaton is None:
+            return (
+                sum(1 for phrase in self.generic_penalty_phrases if phrase in reply_lower),
+                sum(1 for phrase in self.quality_indicators if phrase in reply_lower),
+                any(vague in reply_lower for vague in self.vague_timelines),
+                any(word in reply_lower for word in self.SPECIFIC_ACTION_WORDS),
+                any(marker in reply_lower for marker in self.ENTHUSIASM_MARKERS)
+            )
+        
+        generic_count = quality_count = 0
+        found_bits = 0
+        for bits, _ in {value for _, value in self._phrase_automaton.iter(reply_lower)}:
+            generic_count += bits & 1
+            quality_count += (bits >> 1) & 1
+            found_bits |= bits
+        return (generic_count, quality_count, bool(found_bits & 4),
+                bool(found_bits & 8), bool(found_bits & 16))
+    
+    def _calibrate_score(self, score: float) -> float:
+        """Apply learning-based calibration and clamp the score to [0, 1]"""
+        
         # ========== LEARNING-BASED CALIBRATION ==========
         
         # If we have learning stats showing low acceptance, reduce confidence
@@ -1486,6 +2614,14 @@ class ConfidenceScorer:
 # CONTENT-SPECIFIC REPLY BUILDER (Priority 1 Enhancement)
 # =============================================================================
 
+# Question words and pronouns stripped from a question to find its subject
+_QUESTION_FILLER_RE = re.compile(
+    r'\b(can you|could you|would you|will you|do you|what|when|where|how|why|which|me|you|to me|them|it|the)\b',
+    re.IGNORECASE
+)
+_QUESTION_PUNCTUATION_RE = re.compile(r'[?,.\n]')
+
+
 class QuestionAnalyzer:
     """
     Analyzes questions to extract what they're actually asking about
@@ -1541,8 +2677,8 @@ class QuestionAnalyzer:
         """Extract what the question is about"""
         # Try to extract noun phrases or key topics
         # Remove question words and punctuation
-        cleaned = re.sub(r'\b(can you|could you|would you|will you|do you|what|when|where|how|why|which|me|you|to me|them|it|the)\b', '', question.lower(), flags=re.IGNORECASE)
-        cleaned = re.sub(r'[?,.\n]', '', cleaned)
+        cleaned = _QUESTION_FILLER_RE.sub('', question.lower())
+        cleaned = _QUESTION_PUNCTUATION_RE.sub('', cleaned)
         cleaned = cleaned.strip()
         
         # Get meaningful words (not too short, not stopwords)
@@ -1848,7 +2984,6 @@ class ContentSpecificReplyBuilder:
         Returns:
             Natural-sounding reply that addresses email specifics
         """
-        import random
         
         sender_name = context.get('sender_name', 'there')
         questions = context.get('questions', [])
@@ -1890,7 +3025,6 @@ class ContentSpecificReplyBuilder:
     
     def _build_greeting(self, sender_name: str, tone: str, context: Dict) -> str:
         """Build contextual greeting"""
-        import random
         
         if tone == 'formal':
             greetings = ["Dear", "Hello"]
@@ -1905,7 +3039,6 @@ class ContentSpecificReplyBuilder:
     def _build_specific_acknowledgment(self, context: Dict, questions: List[str], 
                                       action_items: List[str], main_topic: str) -> str:
         """Build acknowledgment that references actual content"""
-        import random
         
         # If there's a specific question
         if questions:
@@ -1996,7 +3129,6 @@ class ContentSpecificReplyBuilder:
     
     def _build_closing(self, tone: str, urgency: str) -> str:
         """Build natural closing"""
-        import random
         
         if tone == 'formal':
             closings = ["Best regards", "Regards", "Sincerely"]
@@ -2028,7 +3160,7 @@ class SenderHistoryAnalyzer:
             behavioral_patterns: Dict from behavioral_patterns.json
         """
         self.behavioral_patterns = behavioral_patterns
-        print("[INFO] Sender History Analyzer initialized")
+        logger.info("Sender History Analyzer initialized")
     
     def get_sender_profile(self, sender_email: str) -> Dict[str, Any]:
         """
@@ -2120,7 +3252,7 @@ class RelationshipContextBuilder:
             sender_analyzer: SenderHistoryAnalyzer instance
         """
         self.sender_analyzer = sender_analyzer
-        print("[INFO] Relationship Context Builder initialized")
+        logger.info("Relationship Context Builder initialized")
     
     def build_context(self, sender_email: str, sender_name: str, 
                      current_urgency: str) -> Dict[str, Any]:
@@ -2184,7 +3316,6 @@ class RelationshipContextBuilder:
     
     def _get_frequent_acknowledgment(self) -> str:
         """Get acknowledgment phrase for frequent contacts"""
-        import random
         phrases = [
             "Great to hear from you again!",
             "Thanks as always for reaching out!",
@@ -2201,7 +3332,7 @@ class PersonalizedGreetingBuilder:
     
     def __init__(self):
         """Initialize personalized greeting builder"""
-        print("[INFO] Personalized Greeting Builder initialized")
+        logger.info("Personalized Greeting Builder initialized")
     
     def build_greeting(self, sender_name: str, relationship_context: Dict) -> str:
         """
@@ -2231,7 +3362,6 @@ class PersonalizedGreetingBuilder:
         else:  # professional
             greetings = [f"Hi {name_to_use}", f"Hello {name_to_use}"]
         
-        import random
         greeting = random.choice(greetings)
         
         # Add relationship acknowledgment if present
@@ -2255,7 +3385,7 @@ class ToneAdapter:
             sender_analyzer: SenderHistoryAnalyzer instance
         """
         self.sender_analyzer = sender_analyzer
-        print("[INFO] Tone Adapter initialized")
+        logger.info("Tone Adapter initialized")
     
     def adapt_tone(self, detected_tone: str, sender_email: str, 
                    sender_name: str, urgency: str) -> str:
@@ -2281,7 +3411,7 @@ class ToneAdapter:
         if profile['tone_consistency'] > 0.8 and profile['interaction_count'] >= 3:
             adapted_tone = profile['preferred_tone']
             if adapted_tone != detected_tone:
-                print(f"[INFO] Tone adapted: {detected_tone} → {adapted_tone} (sender preference, {profile['interaction_count']} interactions)")
+                logger.debug("Tone adapted: %s → %s (sender preference, %s interactions)", detected_tone, adapted_tone, profile['interaction_count'])
             return adapted_tone
         
         # Moderate preference influence (blend)
@@ -2290,12 +3420,12 @@ class ToneAdapter:
             
             # If detected is formal but sender prefers casual, meet in middle (business)
             if detected_tone == 'formal' and preferred == 'casual':
-                print(f"[INFO] Tone moderated: formal → business (sender preference)")
+                logger.debug("Tone moderated: formal → business (sender preference)")
                 return 'business'
             
             # If detected is casual but sender prefers formal, meet in middle (business)
             if detected_tone == 'casual' and preferred == 'formal':
-                print(f"[INFO] Tone moderated: casual → business (sender preference)")
+                logger.debug("Tone moderated: casual → business (sender preference)")
                 return 'business'
         
         # No override needed
@@ -2329,7 +3459,7 @@ class LearnedPhraseInjector:
         # Filter to ensure only SHORT phrases (safety check)
         self.commonly_added = [p for p in self.commonly_added if len(p) < 60]
         
-        print(f"[INFO] Learned Phrase Injector initialized ({len(self.commonly_added)} short phrases)")
+        logger.info("Learned Phrase Injector initialized (%s short phrases)", len(self.commonly_added))
     
     def inject_learned_phrases(self, reply: str, context: Dict[str, Any]) -> str:
         """
@@ -2378,7 +3508,6 @@ class LearnedPhraseInjector:
         for generic in generic_patterns:
             if generic in reply_lower:
                 # User prefers different greeting
-                import random
                 learned = random.choice(learned_greetings)
                 
                 # Extract just the greeting part (first sentence)
@@ -2459,7 +3588,6 @@ class LearnedPhraseInjector:
         for vague in vague_patterns:
             if vague in reply_lower:
                 # Find a relevant learned timeline phrase
-                import random
                 learned_timeline = random.choice(timeline_phrases)
                 
                 # Extract the timeline part
@@ -2494,7 +3622,6 @@ class LearnedPhraseInjector:
         for generic in generic_acks:
             if generic in reply_lower:
                 # Replace with more natural learned phrase
-                import random
                 learned_ack = random.choice(acknowledgments)
                 
                 # Extract acknowledgment part
@@ -2526,7 +3653,7 @@ class CategorySpecificAdapter:
         self.learning_stats = learning_stats or {}
         self.category_performance = self.learning_stats.get('method_performance', {})
         
-        print("[INFO] Category-Specific Adapter initialized")
+        logger.info("Category-Specific Adapter initialized")
     
     def adapt_for_category(self, reply: str, category: str, confidence: float) -> Tuple[str, float]:
         """
@@ -2549,7 +3676,7 @@ class CategorySpecificAdapter:
             # If this category has low acceptance, reduce confidence
             if acceptance_rate < 0.5:
                 confidence *= 0.9
-                print(f"[INFO] Category '{category}' has {acceptance_rate*100:.0f}% acceptance - confidence reduced")
+                logger.debug("Category '%s' has %.0f%% acceptance - confidence reduced", category, acceptance_rate*100)
         
         # Category-specific enhancements
         if category == 'meeting_request':
@@ -2585,22 +3712,129 @@ class CategorySpecificAdapter:
         return reply
 
 
+# =============================================================================
+# UNIFIED EMAIL ANALYZER
+# =============================================================================
+
+class EmailAnalysis:
+    """
+    Analysis bundle for one email: context, reply necessity, edge cases and
+    sensitive topics. Subject/body/senders are lowercased once and shared by
+    every gate; each result is computed on first access, so callers that
+    stop at an early gate never pay for the later ones.
+    """
+    
+    def __init__(self, analyzer: 'UnifiedEmailAnalyzer', view: _EmailView,
+                 context: Optional[Dict[str, Any]] = None):
+        self._analyzer = analyzer
+        self.view = view
+        self.subject_lower = view.subject.lower()
+        self.body_lower = view.body.lower()
+        if context is not None:
+            self.context = context
+    
+    @functools.cached_property
+    def full_lower(self) -> str:
+        """Lowercased "subject body", shared by the edge-case and sensitive gates"""
+        return f"{self.subject_lower} {self.body_lower}"
+    
+    @functools.cached_property
+    def context(self) -> Dict[str, Any]:
+        return self._analyzer.context_extractor._extract_context_view(self.view)
+    
+    @functools.cached_property
+    def necessity(self) -> Dict[str, Any]:
+        return self._analyzer.necessity_analyzer.analyze_lowered(
+            self.subject_lower, self.body_lower,
+            self.view.sender_email.lower(),
+            self.context
+        )
+    
+    @functools.cached_property
+    def edge_case(self) -> Dict[str, Any]:
+        return self._analyzer.edge_case_handler.analyze_lowered(
+            self.view.body, self.subject_lower, self.body_lower,
+            self.view.sender.lower(), self.full_lower
+        )
+    
+    @functools.cached_property
+    def sensitive(self) -> Dict[str, Any]:
+        return self._analyzer.sensitive_detector.detect_sensitive_lowered(
+            self.body_lower, self.subject_lower, self.full_lower
+        )
+
+
+class UnifiedEmailAnalyzer:
+    """
+    Single entry point for the pre-generation gates (context, reply
+    necessity, edge cases, sensitive topics)
+    """
+    
+    def __init__(self, context_extractor: 'EmailContextExtractor',
+                 necessity_analyzer: ReplyNecessityAnalyzer,
+                 edge_case_handler: EdgeCaseHandler,
+                 sensitive_detector: SensitiveTopicDetector):
+        self.context_extractor = context_extractor
+        self.necessity_analyzer = necessity_analyzer
+        self.edge_case_handler = edge_case_handler
+        self.sensitive_detector = sensitive_detector
+    
+    def analyze(self, email_data: Dict[str, Any],
+                context: Optional[Dict[str, Any]] = None,
+                view: Optional[_EmailView] = None) -> EmailAnalysis:
+        """Return the (lazily evaluated) analysis bundle for an email"""
+        if view is None:
+            view = _EmailView.from_dict(email_data)
+        return EmailAnalysis(self, view, context)
+    
+    def analyze_many(self, emails: List[Dict[str, Any]],
+                     views: Optional[List[_EmailView]] = None) -> List[EmailAnalysis]:
+        """
+        Analysis bundles for several emails, with context for all of them
+        extracted up front in one batched spaCy pass
+        
+        If the batch extraction fails, each bundle extracts its own context
+        on first use instead.
+        """
+        if views is None:
+            views = [_EmailView.from_dict(email_data) for email_data in emails]
+        try:
+            contexts = self.context_extractor._extract_context_views(views)
+        except Exception as e:
+            logger.warning("Batch context extraction failed: %s", e)
+            contexts = [None] * len(views)
+        return [EmailAnalysis(self, view, context) for view, context in zip(views, contexts)]
+
+
 # =============================================================================
 # MAIN SMART REPLY GENERATOR
 # =============================================================================
 
+# Vague timeline words in closings, replaced by a concrete deadline when known
+_TIMELINE_WORD_RE = re.compile(r'\b(?:shortly|soon)\b')
+
+
 class SmartReplyGenerator:
     """
     Main class orchestrating smart reply generation
     """
     
+    # Safe mode template rows, highest priority first (general_sensitive is
+    # the catch-all), and template columns
+    SAFE_MODE_PRIORITY = (
+        'legal', 'hr_personnel', 'financial_sensitive', 'confidential',
+        'crisis', 'ethical', 'general_sensitive'
+    )
+    SAFE_MODE_TONES = ('formal', 'business', 'casual')
+    
     def __init__(self, config: Optional[SmartReplyConfig] = None):
         """Initialize the smart reply generator"""
         
-        print("\n[INFO] INITIALIZING SMART REPLY GENERATOR")
-        print("=" * 60)
-        
         self.config = config or SmartReplyConfig()
+        logger.setLevel(self.config.log_level)
+        
+        logger.info("INITIALIZING SMART REPLY GENERATOR")
+        logger.info("=" * 60)
         
         # Initialize components
         self.context_extractor = EmailContextExtractor()
@@ -2611,9 +3845,9 @@ class SmartReplyGenerator:
             try:
                 from reply_learning_tracker import ReplyLearningTracker
                 self.learning_tracker = ReplyLearningTracker()
-                print("[INFO] Learning tracker enabled")
+                logger.info("Learning tracker enabled")
             except ImportError:
-                print("[WARNING] Learning tracker not available")
+                logger.warning("Learning tracker not available")
                 self.learning_tracker = None
         else:
             self.learning_tracker = None
@@ -2621,7 +3855,7 @@ class SmartReplyGenerator:
         # Initialize Enhanced Confidence Scorer with learning stats (Priority 3)
         learning_stats = self._load_learning_stats()
         self.confidence_scorer = ConfidenceScorer(learning_stats)
-        print("[INFO] Enhanced confidence scorer initialized")
+        logger.info("Enhanced confidence scorer initialized")
         
         # Initialize safety components (Phase 2)
         self.sensitive_detector = SensitiveTopicDetector()
@@ -2630,10 +3864,16 @@ class SmartReplyGenerator:
         # Initialize reply necessity analyzer (NEW)
         self.reply_necessity_analyzer = ReplyNecessityAnalyzer()
         
+        # All pre-generation gates behind one entry point
+        self._unified_analyzer = UnifiedEmailAnalyzer(
+            self.context_extractor, self.reply_necessity_analyzer,
+            self.edge_case_handler, self.sensitive_detector
+        )
+        
         # Initialize Content-Specific Reply Builder (Priority 1 Enhancement)
         user_prefs = self.learning_tracker.user_preferences if self.learning_tracker else None
         self.content_reply_builder = ContentSpecificReplyBuilder(user_prefs)
-        print("[INFO] Content-specific reply builder initialized")
+        logger.info("Content-specific reply builder initialized")
         
         # Initialize Sender Intelligence System (Priority 2 Enhancement)
         behavioral_data = self._load_behavioral_patterns()
@@ -2641,18 +3881,32 @@ class SmartReplyGenerator:
         self.relationship_builder = RelationshipContextBuilder(self.sender_analyzer)
         self.greeting_builder = PersonalizedGreetingBuilder()
         self.tone_adapter = ToneAdapter(self.sender_analyzer)
-        print("[INFO] Sender intelligence system initialized")
+        logger.info("Sender intelligence system initialized")
         
         # Initialize Active Learning Application (Priority 4 Enhancement)
         self.phrase_injector = LearnedPhraseInjector(user_prefs)
         self.category_adapter = CategorySpecificAdapter(learning_stats)
-        print("[INFO] Active learning application initialized")
+        logger.info("Active learning application initialized")
         
         # Load templates for fallback/combination
         self._initialize_templates()
         
-        print("[OK] Smart Reply Generator ready!")
-        print("=" * 60)
+        # Generated replies - exact repeats first, then (optionally) near-duplicates
+        self._reply_cache = AnalysisCache(maxsize=self.config.reply_cache_size)
+        self._semantic_reply_cache = None
+        if self.config.use_semantic_reply_cache:
+            self._semantic_reply_cache = SemanticReplyCache(
+                maxsize=self.config.reply_cache_size,
+                threshold=self.config.semantic_cache_threshold
+            )
+        self._reply_cache_stats = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0}
+        
+        # Models normally load on first use; batch pipelines can warm them here
+        if self.config.eager_load:
+            self.context_extractor.nlp
+        
+        logger.info("Smart Reply Generator ready!")
+        logger.info("=" * 60)
     
     def _initialize_templates(self):
         """Initialize template components"""
@@ -2681,6 +3935,21 @@ class SmartReplyGenerator:
             }
         }
         
+        # Openings as (prefix, suffix) around the sender name, and closings as
+        # one (urgency, tone) table of (plain, with-deadline template) pairs -
+        # the template has a {deadline} slot where the vague timeline word was
+        self._opening_parts = {
+            tone: tuple(template.split('{sender_name}')) for tone, template in self.openings.items()
+        }
+        self._closing_table = {
+            (urgency, tone): (
+                closing,
+                _TIMELINE_WORD_RE.sub('by {deadline}', closing.replace('{', '{{').replace('}', '}}'))
+            )
+            for urgency, closings in self.closings.items()
+            for tone, closing in closings.items()
+        }
+        
         # Safe mode templates for sensitive topics (Phase 2)
         self.safe_mode_templates = {
             'legal': {
@@ -2719,6 +3988,18 @@ class SmartReplyGenerator:
                 'casual': "Thanks for reaching out. I understand this is sensitive. Let me review this carefully and I'll get back to you soon."
             }
         }
+        
+        # Safe mode templates as a (category priority x tone) grid. Each
+        # category is one bit, so the lowest set bit of an email's category
+        # mask is its highest-priority template row.
+        self._safe_template_grid = [
+            [self.safe_mode_templates[category][tone] for tone in self.SAFE_MODE_TONES]
+            for category in self.SAFE_MODE_PRIORITY
+        ]
+        self._safe_category_bits = {
+            category: 1 << row for row, category in enumerate(self.SAFE_MODE_PRIORITY)
+        }
+        self._safe_tone_ids = {tone: column for column, tone in enumerate(self.SAFE_MODE_TONES)}
     
     def _load_behavioral_patterns(self) -> Dict:
         """Load behavioral patterns from JSON file"""
@@ -2731,10 +4012,10 @@ class SmartReplyGenerator:
                 with open(patterns_path, 'r') as f:
                     return json.load(f)
             else:
-                print("[WARNING] behavioral_patterns.json not found, using empty patterns")
+                logger.warning("behavioral_patterns.json not found, using empty patterns")
                 return {'communication_style': {}, 'priority_patterns': {}}
         except Exception as e:
-            print(f"[WARNING] Error loading behavioral patterns: {e}")
+            logger.warning("Error loading behavioral patterns: %s", e)
             return {'communication_style': {}, 'priority_patterns': {}}
     
     def _load_learning_stats(self) -> Dict:
@@ -2748,10 +4029,10 @@ class SmartReplyGenerator:
                 with open(stats_path, 'r') as f:
                     return json.load(f)
             else:
-                print("[WARNING] learning_stats.json not found, using defaults")
+                logger.warning("learning_stats.json not found, using defaults")
                 return {'overall_acceptance_rate': '100%'}
         except Exception as e:
-            print(f"[WARNING] Error loading learning stats: {e}")
+            logger.warning("Error loading learning stats: %s", e)
             return {'overall_acceptance_rate': '100%'}
     
     def generate_smart_reply(self, email_data: Dict[str, Any], 
@@ -2766,8 +4047,177 @@ class SmartReplyGenerator:
         Returns:
             Dict with generated reply, confidence score, metadata
         """
+        return self.generate_smart_reply_batch([email_data], [detected_tone])[0]
+    
+    def generate_smart_reply_batch(self, email_list: List[Dict[str, Any]],
+                                   tones: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate smart replies for several emails
+        
+        Cached replies are returned first; context for the remaining emails is
+        extracted in one batched spaCy pass, then each email goes through the
+        usual gates and reply generation. Identical emails in the batch are
+        generated once and the others get a copy of that reply.
+        
+        Args:
+            email_list: Email data dicts with subject, body, sender, etc.
+            tones: Tone to match for each email (defaults to 'business')
+            
+        Returns:
+            List of result dicts, in the same order as email_list
+        """
+        
+        if tones is None:
+            tones = ['business'] * len(email_list)
+        elif len(tones) != len(email_list):
+            raise ValueError(f"Got {len(tones)} tones for {len(email_list)} emails")
+        
+        results = [None] * len(email_list)
+        pending = []  # (index, email_data, view, tone, cache_key, embedding, match_key)
+        pending_indexes = {}  # cache_key -> index of the pending email generating it
+        duplicates = []  # (index, index of the identical pending email)
+        
+        for index, (email_data, tone) in enumerate(zip(email_list, tones)):
+            logger.debug("Generating smart reply for: %s", email_data.get('subject', 'No Subject'))
+            
+            view = _EmailView.from_dict(email_data)
+            cache_key = self._reply_cache_key(view, tone)
+            if cache_key is not None and cache_key in pending_indexes:
+                self._reply_cache_stats['exact_hits'] += 1
+                logger.debug("Reusing reply from earlier in the batch (identical email)")
+                duplicates.append((index, pending_indexes[cache_key]))
+                continue
+            
+            cached, embedding, match_key = self._lookup_cached_reply(view, tone, cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                if cache_key is not None:
+                    pending_indexes[cache_key] = index
+                pending.append((index, email_data, view, tone, cache_key, embedding, match_key))
+        
+        if pending:
+            analyses = self._unified_analyzer.analyze_many(
+                [email_data for _, email_data, _, _, _, _, _ in pending],
+                [view for _, _, view, _, _, _, _ in pending]
+            )
+            
+            for (index, email_data, view, tone, cache_key, embedding, match_key), analysis in zip(pending, analyses):
+                result = self._generate_smart_reply(email_data, tone, analysis)
+                
+                # Fallback replies come from a failure - don't keep them
+                if result['generation_method'] != 'fallback':
+                    self._reply_cache.put(cache_key, result)
+                    if self._semantic_reply_cache is not None:
+                        self._semantic_reply_cache.put(embedding, match_key, result)
+                
+                results[index] = result
+            
+            for index, original_index in duplicates:
+                results[index] = copy.deepcopy(results[original_index])
+        
+        return results
+    
+    def generate_many(self, emails: List[Dict[str, Any]], tones: Optional[List[str]] = None,
+                      max_workers: Optional[int] = None, chunk_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Generate replies for a large offline batch across worker processes
+        
+        Each worker builds its own generator (loading the models once) and
+        runs generate_smart_reply_batch on chunks of chunk_size emails.
+        Workers are spawned, so scripts calling this need an
+        ``if __name__ == '__main__':`` guard. Small batches (or
+        max_workers=1) run in this process.
+        
+        Args:
+            emails: Email data dicts with subject, body, sender, etc.
+            tones: Tone to match for each email (defaults to 'business')
+            max_workers: Worker processes (defaults to the CPU count)
+            chunk_size: Emails per generate_smart_reply_batch call
+            
+        Returns:
+            List of result dicts, in the same order as emails
+        """
+        
+        if tones is None:
+            tones = ['business'] * len(emails)
+        elif len(tones) != len(emails):
+            raise ValueError(f"Got {len(tones)} tones for {len(emails)} emails")
+        
+        if max_workers == 1 or len(emails) <= chunk_size:
+            return self.generate_smart_reply_batch(emails, tones)
+        
+        chunks = [
+            (emails[start:start + chunk_size], tones[start:start + chunk_size])
+            for start in range(0, len(emails), chunk_size)
+        ]
+        
+        # Each worker caps its own thread pools (see _init_reply_worker) -
+        # this process's environment is left alone
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_reply_worker,
+            initargs=(self.config,)
+        ) as executor:
+            results = []
+            for chunk_results in executor.map(_generate_reply_chunk, *zip(*chunks)):
+                results.extend(chunk_results)
+        
+        return results
+    
+    def _reply_cache_key(self, view: _EmailView, detected_tone: str) -> Optional[bytes]:
+        """Exact reply cache key for this email and tone (None if it can't be cached)"""
+        return self._reply_cache.make_key(
+            view.subject, view.body, view.reply_address, view.sender_name, detected_tone,
+            view.has_attachments,
+            view.attachment_count,
+            view.priority_level
+        )
+    
+    def _lookup_cached_reply(self, view: _EmailView, detected_tone: str,
+                             cache_key: Optional[bytes]) -> Tuple:
+        """
+        Look up a previously generated reply for this email
+        
+        Returns:
+            (cached result or None, embedding, semantic match key)
+        """
+        
+        subject = view.subject
+        body = view.body
+        sender_email = view.reply_address
+        sender_name = view.sender_name
+        
+        cached = self._reply_cache.get(cache_key)
+        if cached is not None:
+            self._reply_cache_stats['exact_hits'] += 1
+            logger.debug("Reusing cached reply (identical email)")
+            return cached, None, None
+        
+        embedding = None
+        match_key = (detected_tone, sender_email, sender_name)
+        if self._semantic_reply_cache is not None:
+            embedding = self._semantic_reply_cache.embed(f"{subject}\n{body[:2000]}")
+            cached = self._semantic_reply_cache.get(embedding, match_key)
+            if cached is not None:
+                self._reply_cache_stats['semantic_hits'] += 1
+                logger.debug("Reusing cached reply (near-duplicate email)")
+                return cached, embedding, match_key
+        
+        self._reply_cache_stats['misses'] += 1
+        return None, embedding, match_key
+    
+    def _generate_smart_reply(self, email_data: Dict[str, Any], detected_tone: str,
+                              analysis: Optional[EmailAnalysis] = None) -> Dict[str, Any]:
+        """
+        Run the full generation pipeline for one email (no caching)
         
-        print(f"\n[INFO] Generating smart reply for: {email_data.get('subject', 'No Subject')}")
+        Args:
+            email_data: Email data with subject, body, sender, etc.
+            detected_tone: Tone to match (formal, business, casual)
+            analysis: email_data's analysis bundle (built here if None)
+        """
         
         result = {
             'reply_text': '',
@@ -2779,18 +4229,22 @@ class SmartReplyGenerator:
         }
         
         try:
+            if analysis is None:
+                analysis = self._unified_analyzer.analyze(email_data)
+            view = analysis.view
+            
             # NEW: Step 0 - Extract context first (needed for reply necessity check)
-            context = self.context_extractor.extract_context(email_data)
+            context = analysis.context
             result['context_used'] = context
             
             # NEW: Step 1 - Check reply necessity FIRST
-            reply_necessity = self.reply_necessity_analyzer.analyze_reply_necessity(email_data, context)
+            reply_necessity = analysis.necessity
             result['metadata']['reply_necessity'] = reply_necessity
             
             # If reply is not needed, return early with recommendation
             if not reply_necessity['needs_reply']:
-                print(f"[INFO] Reply not needed: {reply_necessity['reason']}")
-                print(f"[INFO] Suggested action: {reply_necessity['suggested_action']}")
+                logger.debug("Reply not needed: %s", reply_necessity['reason'])
+                logger.debug("Suggested action: %s", reply_necessity['suggested_action'])
                 
                 # Check if we should generate optional acknowledgment
                 optional_reply = self.bart_generator.generate_no_reply_message(
@@ -2815,10 +4269,13 @@ class SmartReplyGenerator:
                 
                 return result
             
+            # Automated mail that does get a reply needs the entities spaCy skipped
+            self.context_extractor._fill_skipped_entities(view, context)
+            
             # PHASE 2: Safety checks before generation
             
             # Step 2: Check for edge cases
-            edge_case_analysis = self.edge_case_handler.analyze_email(email_data)
+            edge_case_analysis = analysis.edge_case
             result['metadata']['edge_case_analysis'] = edge_case_analysis
             
             if edge_case_analysis['is_edge_case'] and not edge_case_analysis['should_generate_reply']:
@@ -2827,20 +4284,17 @@ class SmartReplyGenerator:
                 result['confidence_level'] = 'low'
                 result['generation_method'] = 'no_reply'
                 result['metadata']['skip_reason'] = edge_case_analysis['edge_case_type']
-                print(f"[INFO] Edge case detected: {edge_case_analysis['edge_case_type']}")
+                logger.debug("Edge case detected: %s", edge_case_analysis['edge_case_type'])
                 return result
             
             # Step 3: Check for sensitive topics
-            sensitive_analysis = self.sensitive_detector.detect_sensitive_content(
-                email_data.get('body', ''),
-                email_data.get('subject', '')
-            )
+            sensitive_analysis = analysis.sensitive
             result['metadata']['sensitive_analysis'] = sensitive_analysis
             
             if sensitive_analysis['is_sensitive'] and self.config.use_safe_mode_for_sensitive:
                 # Use safe mode template for sensitive topics
-                print(f"[WARNING] Sensitive content detected: {sensitive_analysis['categories']}")
-                print(f"[INFO] Using safe mode template (Risk: {sensitive_analysis['risk_level']})")
+                logger.debug("Sensitive content detected: %s", sensitive_analysis['categories'])
+                logger.debug("Using safe mode template (Risk: %s)", sensitive_analysis['risk_level'])
                 
                 reply = self._generate_safe_mode_reply(
                     email_data=email_data,
@@ -2859,8 +4313,8 @@ class SmartReplyGenerator:
             # Context already extracted in Step 0, continue to Step 4
             
             # PRIORITY 2 ENHANCEMENT: Apply Sender Intelligence
-            sender_email = email_data.get('sender', email_data.get('sender_email', ''))
-            sender_name = email_data.get('sender_name', 'there')
+            sender_email = view.reply_address
+            sender_name = view.sender_name
             
             # Get sender profile and relationship context
             sender_profile = self.sender_analyzer.get_sender_profile(sender_email)
@@ -2889,7 +4343,7 @@ class SmartReplyGenerator:
             }
             
             # Step 4: Generate CONTENT-SPECIFIC reply (Priority 1 Enhancement)
-            print("[INFO] Using Content-Specific Reply Builder...")
+            logger.debug("Using Content-Specific Reply Builder...")
             reply = self.content_reply_builder.build_reply(
                 context, 
                 detected_tone,
@@ -2898,7 +4352,7 @@ class SmartReplyGenerator:
             )
             
             # PRIORITY 4 ENHANCEMENT: Apply Active Learning
-            print("[INFO] Applying learned patterns from edit history...")
+            logger.debug("Applying learned patterns from edit history...")
             
             # Step 4a: Inject learned phrases (Priority 4)
             reply = self.phrase_injector.inject_learned_phrases(reply, context)
@@ -2944,15 +4398,15 @@ class SmartReplyGenerator:
                 'topic_extracted': context['main_topic'],
                 'category': context['email_category'],
                 'urgency': context['urgency_level'],
-                'entities_found': sum(len(v) for v in context['entities'].values()),
+                'entities_found': sum(map(len, context['entities'].values())),
                 'has_questions': len(context['questions']) > 0,
                 'has_deadlines': len(context['deadlines']) > 0
             }
             
-            print(f"[OK] Reply generated | Confidence: {confidence} ({result['confidence_level']})")
+            logger.debug("Reply generated | Confidence: %s (%s)", confidence, result['confidence_level'])
             
         except Exception as e:
-            print(f"[ERROR] Smart reply generation failed: {e}")
+            logger.error("Smart reply generation failed: %s", e)
             result['reply_text'] = self._generate_safe_fallback(email_data['sender_name'])
             result['confidence_score'] = 0.3
             result['confidence_level'] = 'low'
@@ -2979,7 +4433,7 @@ class SmartReplyGenerator:
         """
         
         if not self.learning_tracker:
-            print("[WARNING] Learning tracker not enabled")
+            logger.warning("Learning tracker not enabled")
             return None
         
         try:
@@ -2990,11 +4444,14 @@ class SmartReplyGenerator:
                 reply_metadata=reply_metadata
             )
             
+            # Learned preferences changed - cached replies may be stale
+            self._clear_reply_caches()
+            
             from dataclasses import asdict
             return asdict(edit)
             
         except Exception as e:
-            print(f"[ERROR] Failed to track edit: {e}")
+            logger.error("Failed to track edit: %s", e)
             return None
     
     def get_learning_insights(self) -> Dict[str, Any]:
@@ -3006,37 +4463,45 @@ class SmartReplyGenerator:
         """
         
         if not self.learning_tracker:
-            return {'message': 'Learning tracker not enabled'}
+            return {
+                'message': 'Learning tracker not enabled',
+                'reply_cache': dict(self._reply_cache_stats)
+            }
         
         try:
             insights = self.learning_tracker.get_learning_insights()
             insights['user_preferences'] = self.learning_tracker.user_preferences
+            insights['reply_cache'] = dict(self._reply_cache_stats)
             return insights
         except Exception as e:
-            print(f"[ERROR] Failed to get insights: {e}")
+            logger.error("Failed to get insights: %s", e)
             return {'error': str(e)}
     
+    def _clear_reply_caches(self):
+        """Drop cached replies (e.g. after learned preferences change)"""
+        self._reply_cache.clear()
+        if self._semantic_reply_cache is not None:
+            self._semantic_reply_cache.clear()
+    
     def _compose_reply(self, sender_name: str, acknowledgment: str, 
                       context: Dict, tone: str) -> str:
         """Compose the final reply from components"""
         
         # Get opening
-        opening = self.openings[tone].format(sender_name=sender_name)
+        prefix, suffix = self._opening_parts[tone]
+        opening = f"{prefix}{sender_name}{suffix}"
         
         # Get closing based on urgency
         urgency = context.get('urgency_level', 'normal')
-        closing = self.closings[urgency][tone]
+        closing, deadline_template = self._closing_table[(urgency, tone)]
         
         # Add specific timeline if deadline mentioned
-        if context.get('deadlines'):
-            deadline = context['deadlines'][0]
-            closing = closing.replace('shortly', f'by {deadline}')
-            closing = closing.replace('soon', f'by {deadline}')
+        deadlines = context.get('deadlines')
+        if deadlines:
+            closing = deadline_template.format(deadline=deadlines[0])
         
         # Compose full reply
-        full_reply = f"{opening}{acknowledgment}{closing}"
-        
-        return full_reply
+        return ''.join((opening, acknowledgment, closing))
     
     def _generate_safe_mode_reply(self, email_data: Dict[str, Any], 
                                   sensitive_analysis: Dict[str, Any], 
@@ -3057,27 +4522,21 @@ class SmartReplyGenerator:
         categories = sensitive_analysis.get('categories', [])
         
         # Select appropriate template based on primary category
-        if 'legal' in categories:
-            template_key = 'legal'
-        elif 'hr_personnel' in categories:
-            template_key = 'hr_personnel'
-        elif 'financial_sensitive' in categories:
-            template_key = 'financial_sensitive'
-        elif 'confidential' in categories:
-            template_key = 'confidential'
-        elif 'crisis' in categories:
-            template_key = 'crisis'
-        elif 'ethical' in categories:
-            template_key = 'ethical'
+        category_bits = self._safe_category_bits
+        category_mask = 0
+        for category in categories:
+            category_mask |= category_bits.get(category, 0)
+        if category_mask:
+            row = (category_mask & -category_mask).bit_length() - 1
         else:
-            template_key = 'general_sensitive'
+            row = len(self.SAFE_MODE_PRIORITY) - 1  # general_sensitive
         
-        # Get template for tone
-        template_body = self.safe_mode_templates[template_key].get(tone, 
-                        self.safe_mode_templates[template_key]['business'])
+        # Get template for tone (business for unknown tones)
+        template_body = self._safe_template_grid[row][self._safe_tone_ids.get(tone, 1)]
         
         # Add opening
-        opening = self.openings[tone].format(sender_name=sender_name)
+        prefix, suffix = self._opening_parts[tone]
+        opening = f"{prefix}{sender_name}{suffix}"
         
         # Add closing
         closing = "\n\nBest regards"
@@ -3100,3 +4559,36 @@ class SmartReplyGenerator:
         return f"Hi {sender_name},\n\nThank you for your email. I'll review this and respond accordingly.\n\nBest regards"
 
 
+# =============================================================================
+# PARALLEL BATCH WORKERS
+# =============================================================================
+
+# Thread pools capped to one thread in generate_many workers
+_WORKER_THREAD_ENV = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# Per-process generator, built once by _init_reply_worker
+_worker_generator: Optional[SmartReplyGenerator] = None
+
+
+def _init_reply_worker(config: SmartReplyConfig):
+    """
+    ProcessPoolExecutor initializer - cap this worker to one intra-op thread
+    (the processes already use every core) and build its generator
+    """
+    global _worker_generator
+    
+    # Only this child's environment - read by libraries the worker loads
+    # from here on; torch is capped directly as it may already be loaded
+    os.environ.update({name: '1' for name in _WORKER_THREAD_ENV})
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    
+    _worker_generator = SmartReplyGenerator(config)
+
+
+def _generate_reply_chunk(emails: List[Dict[str, Any]], tones: List[str]) -> List[Dict[str, Any]]:
+    """Generate replies for one chunk in a worker process"""
+    return _worker_generator.generate_smart_reply_batch(emails, tones)
@@ -0,0 +1,313 @@
+"""
+=============================================================================
+ACCELERATED MATCHING TESTS - Hyperscan / Aho-Corasick vs the fallbacks
+=============================================================================
+The optional scanning engines must give exactly the answers of the fallback
+paths used when they aren't installed:
+- Reply necessity intents (Hyperscan pattern database vs re)
+- Confidence scores (Aho-Corasick phrase automaton vs substring checks)
+- Category and urgency keywords (Aho-Corasick keyword automaton vs bytes.find)
+- Sensitive topics (Aho-Corasick automaton and Hyperscan prefilter vs re)
+
+Checks for an engine that isn't installed are reported as SKIP.
+
+Run: python test_accelerated_matching.py
+=============================================================================
+"""
+
+import sys
+
+import smart_reply_generator
+from smart_reply_generator import (
+    ConfidenceScorer,
+    EmailContextExtractor,
+    ReplyNecessityAnalyzer,
+    SensitiveTopicDetector,
+    _EmailView
+)
+
+
+# (subject, body) - the tricky cases are phrases spanning the subject/body
+# join, non-ASCII letters next to keywords, and characters only IGNORECASE folds
+NECESSITY_EMAILS = [
+    ("Security Alert", "We noticed suspicious activity on your account."),
+    ("Your receipt", "Thanks for shopping with us."),
+    ("Thanks for your", "purchase today"),
+    ("Save the", "date for the launch. Could you review the draft?"),
+    ("Your order", "has been shipped and will arrive Friday."),
+    ("Weekly digest", "In this issue: three new articles."),
+    ("Exclusive offer", "Shop now - limited time only!"),
+    ("You're invited", "Please join us for dinner. RSVP by Friday."),
+    ("Status update", "This is an automated message."),
+    ("Project question", "Can you send me the report by Friday?"),
+    ("Hello", "Just catching up, hope all is well."),
+    ("hi", "ınvoice attached"),
+    ("hi", "claſſ ſubſcriber"),
+    ("hi", "éreceipt here"),
+    ("hi", "receiptà and invoiceé"),
+    ("Line\nbreak", "your\nsubscription renewed"),
+    ("", ""),
+    ("Your " + "x" * 200, "has been waiting"),
+    ("Password reset", "Click to verify your email address."),
+    ("Meeting", "Can you attend? Venue and date and time below."),
+]
+
+CONFIDENCE_REPLIES = [
+    "",
+    "Hi Alice,\n\nThanks! I'll send you the report by Friday. Great question about the meeting status update.\n\nBest",
+    "I'll get back to you soon. I'll look into this later.",
+    "Acme and John will review by eod, within 2 hours, this morning!",
+    " ".join(["word"] * 60),
+    "Good question - happy to help. I'll share the update shortly.",
+    "Thanks for your email about the budget. I'll follow up eventually, in the future.",
+    "Ünicode İ reply with SEND and Schedule",
+]
+
+CONFIDENCE_CONTEXTS = [
+    {},
+    {
+        'questions': ["When is the status update due?"],
+        'action_items': ["Please send the report"],
+        'main_topic': "Quarterly report",
+        'entities': {'people': ["John"], 'organizations': ["Acme"]}
+    },
+    {
+        'questions': ["Are you available for a call?"],
+        'main_topic': "Call"
+    },
+]
+
+# (subject, body) - keywords that span the join, sit inside other words or
+# next to non-ASCII letters, and text whose lower() changes length
+KEYWORD_EMAILS = [
+    ("Save the", "date for our gala"),
+    ("Weekly", "update: three new articles"),
+    ("Exclusive", "offer: shop today"),
+    ("URGENT", "Please send the invoice ASAP"),
+    ("Re: meeting", "Are you available for a call tomorrow?"),
+    ("Thanks!", "I really appreciate it."),
+    ("Following up", "Just checking in on the status."),
+    ("Problem", "The build is broken - can you help?"),
+    ("İstanbul trip", "receipts attached, İNVOICE too"),
+    ("hi", "éreceipt and newsletterà"),
+    ("Σ", "ΣUBSCRIBER unsubscribe"),
+    ("Your account", "has been updated. Action required."),
+    ("", ""),
+    ("You're", "invited - please join us"),
+]
+
+# (subject, body) - dotless i / long s (matched by the IGNORECASE regexes),
+# keywords inside words or next to non-ASCII letters, and phrase/word overlaps
+SENSITIVE_EMAILS = [
+    ("", "we face lıtıgatıon"),
+    ("Claſſ action", "ſee the lawſuit"),
+    ("LEGAL", "Our ATTORNEY will call about the Lawsuit."),
+    ("", "wrongful termination and termination of contract"),
+    ("Medical", "diagnosis attached, see the doctor"),
+    ("", "élitigation and lawsuità"),
+    ("Harassment report", "HR complaint filed"),
+    ("Salary", "compensation review and salary negotiation"),
+    ("", "password reset for your bank account"),
+    ("Hello", "Just checking in about lunch."),
+    ("", ""),
+    ("İnvestigation", "confıdential settlement"),
+]
+
+
+class AcceleratedMatchingTester:
+    """Compares each optional engine with the fallback it replaces"""
+    
+    def run_all_tests(self):
+        """Run every comparison; each returns a list of per-case results"""
+        results = {
+            'necessity_hyperscan': self.test_necessity_hyperscan(),
+            'confidence_automaton': self.test_confidence_automaton(),
+            'keyword_automaton': self.test_keyword_automaton(),
+            'sensitive_topics': self.test_sensitive_topics()
+        }
+        
+        self.print_summary(results)
+        return results
+    
+    # =========================================================================
+    # REPLY NECESSITY - Hyperscan vs re
+    # =========================================================================
+    
+    def test_necessity_hyperscan(self):
+        """Hyperscan and the re fallback agree on the reply-necessity intent"""
+        print("\n" + "=" * 80)
+        print("REPLY NECESSITY: Hyperscan vs re")
+        print("=" * 80)
+        
+        if ReplyNecessityAnalyzer._matcher is None:
+            print("  SKIP: hyperscan not installed")
+            return None
+        
+        matcher = ReplyNecessityAnalyzer._matcher
+        results = []
+        for subject, body in NECESSITY_EMAILS:
+            email = {'subject': subject, 'body': body, 'sender_email': 'alice@example.com'}
+            accelerated = ReplyNecessityAnalyzer().analyze_reply_necessity(email, {})
+            
+            ReplyNecessityAnalyzer._matcher = None
+            try:
+                fallback = ReplyNecessityAnalyzer().analyze_reply_necessity(email, {})
+            finally:
+                ReplyNecessityAnalyzer._matcher = matcher
+            
+            results.append(self._check((subject, body), accelerated, fallback))
+        return results
+    
+    # =========================================================================
+    # CONFIDENCE - phrase automaton vs substring checks
+    # =========================================================================
+    
+    def test_confidence_automaton(self):
+        """The phrase automaton and the per-phrase checks give the same score"""
+        print("\n" + "=" * 80)
+        print("CONFIDENCE: phrase automaton vs substring checks")
+        print("=" * 80)
+        
+        scorer = ConfidenceScorer()
+        if scorer._phrase_automaton is None:
+            print("  SKIP: pyahocorasick not installed")
+            return None
+        
+        # A scorer built as if pyahocorasick weren't installed
+        build_automaton = smart_reply_generator._phrase_group_automaton
+        ahocorasick = smart_reply_generator.ahocorasick
+        build_automaton.cache_clear()
+        smart_reply_generator.ahocorasick = None
+        try:
+            fallback_scorer = ConfidenceScorer()
+        finally:
+            smart_reply_generator.ahocorasick = ahocorasick
+            build_automaton.cache_clear()
+        
+        results = []
+        for context in CONFIDENCE_CONTEXTS:
+            for reply in CONFIDENCE_REPLIES:
+                results.append(self._check(
+                    (reply[:40], sorted(context)),
+                    scorer.calculate_confidence(context, reply),
+                    fallback_scorer.calculate_confidence(context, reply)
+                ))
+        return results
+    
+    # =========================================================================
+    # CATEGORY / URGENCY KEYWORDS - keyword automaton vs bytes.find
+    # =========================================================================
+    
+    def test_keyword_automaton(self):
+        """The keyword automaton and bytes.find find the same keyword groups"""
+        print("\n" + "=" * 80)
+        print("KEYWORDS: keyword automaton vs bytes.find")
+        print("=" * 80)
+        
+        extractor = EmailContextExtractor()
+        if extractor._keyword_automaton is None:
+            print("  SKIP: pyahocorasick not installed")
+            return None
+        
+        fallback_extractor = EmailContextExtractor()
+        fallback_extractor._keyword_automaton = None
+        
+        results = []
+        for subject, body in KEYWORD_EMAILS:
+            view = _EmailView.from_dict({'subject': subject, 'body': body})
+            has_keywords = extractor._scan_keywords(view)[-1]
+            fallback_has_keywords = fallback_extractor._scan_keywords(view)[-1]
+            
+            results.append(self._check(
+                (subject, body),
+                {group: has_keywords(group) for group in extractor._keyword_groups},
+                {group: fallback_has_keywords(group) for group in extractor._keyword_groups}
+            ))
+        return results
+    
+    # =========================================================================
+    # SENSITIVE TOPICS - automaton / Hyperscan prefilter vs re
+    # =========================================================================
+    
+    def test_sensitive_topics(self):
+        """Each installed sensitive-topic engine gives the regex-only result"""
+        print("\n" + "=" * 80)
+        print("SENSITIVE TOPICS: automaton / Hyperscan prefilter vs re")
+        print("=" * 80)
+        
+        detector = SensitiveTopicDetector()
+        engines = {}
+        if detector._automaton is not None:
+            engines['automaton'] = detector
+        if detector._matcher is not None:
+            prefilter = SensitiveTopicDetector()
+            prefilter._automaton = None
+            engines['hyperscan'] = prefilter
+        if not engines:
+            print("  SKIP: neither pyahocorasick nor hyperscan installed")
+            return None
+        
+        fallback_detector = SensitiveTopicDetector()
+        fallback_detector._automaton = None
+        fallback_detector._matcher = None
+        
+        results = []
+        for subject, body in SENSITIVE_EMAILS:
+            fallback = self._sensitive_result(fallback_detector, subject, body)
+            for name, engine in engines.items():
+                results.append(self._check(
+                    (name, subject, body), self._sensitive_result(engine, subject, body), fallback
+                ))
+        return results
+    
+    def _sensitive_result(self, detector, subject, body):
+        """detect_sensitive_content() with the (unordered) keywords sorted"""
+        result = detector.detect_sensitive_content(body, subject)
+        return {**result, 'matched_keywords': sorted(result['matched_keywords'])}
+    
+    # =========================================================================
+    # HELPERS / SUMMARY
+    # =========================================================================
+    
+    def _check(self, case, accelerated, fallback):
+        """Compare one case's results and print its status"""
+        passed = accelerated == fallback
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"  {status}: {case!r}")
+        if not passed:
+            print(f"      accelerated: {accelerated!r}")
+            print(f"      fallback:    {fallback!r}")
+        return {'test_name': repr(case), 'passed': passed}
+    
+    def print_summary(self, results):
+        """Print test summary"""
+        print("\n" + "=" * 80)
+        print("TEST SUMMARY - ACCELERATED MATCHING")
+        print("=" * 80)
+        
+        for test_name, test_results in results.items():
+            if test_results is None:
+                print(f"  SKIP: {test_name}")
+                continue
+            passed_tests = sum(1 for r in test_results if r['passed'])
+            status = "✅ PASS" if passed_tests == len(test_results) else "❌ FAIL"
+            print(f"  {status}: {test_name} ({passed_tests}/{len(test_results)})")
+        
+        print("=" * 80 + "\n")
+
+
+def main():
+    """Main test execution - exits non-zero if any comparison failed"""
+    tester = AcceleratedMatchingTester()
+    results = tester.run_all_tests()
+    
+    failed = any(
+        not r['passed']
+        for test_results in results.values() if test_results is not None
+        for r in test_results
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ Run: python test_priorities.py
 """
 
 import json
+import logging
 import os
 from smart_reply_generator import SmartReplyGenerator, SmartReplyConfig
 from datetime import datetime
@@ -570,4 +571,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     main()